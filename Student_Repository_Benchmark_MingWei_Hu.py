@@ -0,0 +1,451 @@
+"""Student_Repository (Benchmarks)
+
+    Data repository of courses, students, and instructors (Benchmarks)
+
+    Author: Ming-Wei Hu
+    Last Updated: November 16th, 2020
+
+"""
+# imports
+from typing import List, Dict, Tuple, Any, Callable, Optional
+from statistics import median
+from subprocess import run, DEVNULL
+from sys import executable
+from time import perf_counter
+from random import Random
+from os.path import join, isdir, isfile
+from tempfile import TemporaryDirectory
+from zipfile import ZipFile
+from io import StringIO
+from contextlib import redirect_stdout
+from threading import Thread
+import gzip
+import json
+
+from Student_Repository_MingWei_Hu import University, UniversityRepository, render_transcript
+from Student_Repository_MingWei_Hu import GradeAttempt, LETTER_GRADE_VALUE, COMPRESSED_EXTENSIONS, SUMMARY_SORT_KEYS
+
+
+MODULE_NAME: str = 'Student_Repository_MingWei_Hu'
+MODULE_FILE: str = f'{MODULE_NAME}.py'
+BASIC_UNIVERSITY: str = './test_suites/basic_university'
+
+
+def time_process(command: List[str], runs: int) -> float:
+    ''' get median wall time in seconds of running command as a new process '''
+    timings: List[float] = []
+    for _ in range(runs):
+        start: float = perf_counter()
+        run(command, stdout=DEVNULL, stderr=DEVNULL, check=False)
+        timings.append(perf_counter() - start)
+
+    return median(timings)
+
+
+def benchmark_startup(runs: int = 20) -> Dict[str, float]:
+    ''' benchmark process startup of module import and command line calls '''
+    return {
+        'python': time_process([executable, '-c', 'pass'], runs),
+        'import': time_process([executable, '-c', f'import {MODULE_NAME}'], runs),
+        'cli validate': time_process(
+            [executable, MODULE_FILE, 'validate', BASIC_UNIVERSITY], runs),
+        'cli students': time_process(
+            [executable, MODULE_FILE, 'students', BASIC_UNIVERSITY], runs),
+    }
+
+
+# defects injected into generated universities, as in test_suites
+DEFECTS: Tuple[str] = (
+    'wrong_fields',
+    'unknown_student',
+    'unknown_instructor',
+    'unknown_major',
+    'unknown_department',
+    'missing_values',
+)
+
+
+def generate_university(directory: str, seed: int, students: int = 100, instructors: int = 10,
+                        majors: int = 3, courses: int = 12, grades_per_student: int = 5,
+                        defect: Optional[str] = None) -> None:
+    ''' write a random university into directory, with an optional defect '''
+    random: Random = Random(seed)
+    major_names: List[str] = [f'M{index:02d}' for index in range(majors)]
+    course_names: List[str] = [
+        f'SSW {500 + index}' for index in range(courses)]
+    letter_grades: List[str] = list(LETTER_GRADE_VALUE)
+
+    # at least one required and one elective course for each major
+    major_lines: List[str] = ['Major\tRequired/Elective\tCourse']
+    for name in major_names:
+        for index, course_name in enumerate(random.sample(course_names, random.randint(2, courses))):
+            major_lines.append(
+                f'{name}\t{"RE"[index % 2]}\t{course_name}')
+
+    student_cwids: List[str] = [
+        f'{10000 + index}' for index in random.sample(range(students * 10), students)]
+    student_lines: List[str] = ['CWID;Name;Major'] + [
+        f'{cwid};Student {cwid};{random.choice(major_names)}' for cwid in student_cwids]
+
+    instructor_cwids: List[str] = [
+        f'{90000 + index}' for index in random.sample(range(instructors * 10), instructors)]
+    instructor_lines: List[str] = ['CWID|Instructor|Dept'] + [
+        f'{cwid}|Instructor {cwid}|{random.choice(major_names)}' for cwid in instructor_cwids]
+
+    # grades in random order, with repeated attempts at some courses
+    grade_lines: List[str] = ['StudentCWID|Course|Grade|InstructorCWID']
+    for _ in range(students * grades_per_student):
+        grade_lines.append('|'.join([
+            random.choice(student_cwids),
+            random.choice(course_names),
+            random.choice(letter_grades),
+            random.choice(instructor_cwids),
+        ]))
+
+    # break a random data line of the file the defect belongs to
+    if defect == 'wrong_fields':
+        lines, index = grade_lines, random.randrange(1, len(grade_lines))
+        lines[index] = lines[index].rsplit('|', 1)[0]
+    elif defect == 'unknown_student':
+        lines, index = grade_lines, random.randrange(1, len(grade_lines))
+        lines[index] = '00000|' + lines[index].split('|', 1)[1]
+    elif defect == 'unknown_instructor':
+        lines, index = grade_lines, random.randrange(1, len(grade_lines))
+        lines[index] = lines[index].rsplit('|', 1)[0] + '|00000'
+    elif defect == 'unknown_major':
+        lines, index = student_lines, random.randrange(1, len(student_lines))
+        lines[index] = lines[index].rsplit(';', 1)[0] + ';UNKNOWN'
+    elif defect == 'unknown_department':
+        lines, index = instructor_lines, random.randrange(
+            1, len(instructor_lines))
+        lines[index] = lines[index].rsplit('|', 1)[0] + '|UNKNOWN'
+    elif defect == 'missing_values':
+        lines, index = student_lines, random.randrange(1, len(student_lines))
+        lines[index] = lines[index].split(';', 1)[0] + ';;' + \
+            lines[index].rsplit(';', 1)[1]
+    elif defect is not None:
+        raise ValueError(f'Unknown defect {defect}.')
+
+    for file_name, lines in [
+        (University.MAJOR_FILE_NAME, major_lines),
+        (University.STUDENT_FILE_NAME, student_lines),
+        (University.INSTRUCTOR_FILE_NAME, instructor_lines),
+        (University.GRADE_FILE_NAME, grade_lines),
+    ]:
+        with open(join(directory, file_name), 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+
+def paged_rows(get_page: Callable, identity: Callable[[List[Any]], Tuple],
+               rows: List[List[Any]], page_size: int = 7) -> List[List[Any]]:
+    ''' collect rows of every summary page, in order of reference rows '''
+    paged: List[List[Any]] = []
+    cursor: Optional[str] = None
+    while True:
+        page, cursor = get_page(page_size=page_size, cursor=cursor)
+        paged.extend(page)
+        if cursor is None:
+            break
+
+    # pages must follow identity order without repeating rows
+    keys: List[Tuple] = [identity(row) for row in paged]
+    if keys != sorted(set(keys)):
+        raise AssertionError('Summary pages are out of order.')
+
+    # reorder to reference row order, leaving None for missing rows
+    paged_by_key: Dict[Tuple, List[Any]] = dict(zip(keys, paged))
+    ordered: List[List[Any]] = [paged_by_key.pop(identity(row), None) for row in rows]
+    return ordered + list(paged_by_key.values())
+
+
+# entity predicates of random page queries, by summary kind
+PAGE_PREDICATES: Dict[str, List[Callable[[Any], bool]]] = {
+    'majors': [lambda major: len(major.required_course_name_set) > len(major.elective_course_name_set)],
+    'students': [lambda student: student.get_gpa() >= 3, lambda student: len(student.courses_by_name) % 2 == 0],
+    'instructors': [lambda instructor: len(instructor.course_name_set) > 1],
+}
+
+
+def random_page_query(university: University, kind: str, random: Random) -> Dict[str, Any]:
+    ''' random filters, sort key and page size of a summary page query of kind '''
+    query: Dict[str, Any] = {'page_size': random.randint(1, 10)}
+    if kind != 'majors':
+        cwids: List[str] = list(university.students if kind == 'students' else university.instructors)
+        group: str = 'major' if kind == 'students' else 'department'
+        query[group] = random.choice([None, None] + list(university.majors))
+        # prefix of a known cwid, or one matching nothing
+        query['cwid_prefix'] = random.choice(
+            ['', '0'] + [cwid[:random.randint(1, len(cwid))] for cwid in random.sample(cwids, min(3, len(cwids)))])
+
+    query['predicate'] = random.choice([None] + PAGE_PREDICATES[kind])
+    # named key, or a callable with many ties broken by identity
+    query['sort_key'] = random.choice(
+        [None, None, lambda entity: len(entity.name)] + list(SUMMARY_SORT_KEYS[kind]))
+    return query
+
+
+def brute_force_page_rows(university: University, kind: str, query: Dict[str, Any]) -> List[List[Any]]:
+    ''' summary rows of page query by filtering and sorting every reference row '''
+    sort_key: Any = query['sort_key']
+    sort_function: Optional[Callable[[Any], Any]] = SUMMARY_SORT_KEYS[kind][sort_key] \
+        if isinstance(sort_key, str) else sort_key
+
+    # (entity, identity, row) of every reference row
+    if kind == 'majors':
+        keyed: List[Tuple[Any, Tuple, List[Any]]] = [
+            (university.majors[row[0]], (row[0],), row) for row in university.get_major_summary_rows()]
+    elif kind == 'students':
+        keyed = [
+            (university.students[row[0]], (row[0],), row) for row in university.get_student_summary_rows()
+            if query['major'] in (None, row[2]) and row[0].startswith(query['cwid_prefix'])
+        ]
+    else:
+        keyed = [
+            (university.instructors[row[0]], (row[0], row[3]), row) for row in university.get_instructor_summary_rows()
+            if query['department'] in (None, row[2]) and row[0].startswith(query['cwid_prefix'])
+        ]
+
+    keyed = [(entity, identity, row) for entity, identity, row in keyed
+             if query['predicate'] is None or query['predicate'](entity)]
+    return [row for entity, identity, row in sorted(keyed, key=lambda keyed_row: (
+        () if sort_function is None else (sort_function(keyed_row[0]),)) + keyed_row[1])]
+
+
+def check_page_queries(university: University, random: Random, queries: int = 40) -> None:
+    ''' check random filtered and sorted page queries against brute force rows '''
+    for _ in range(queries):
+        # few majors, so mostly query students and instructors
+        kind: str = random.choice(['majors', 'students', 'students', 'instructors', 'instructors'])
+        query: Dict[str, Any] = random_page_query(university, kind, random)
+        get_page: Callable = getattr(university, f'get_{kind[:-1]}_summary_page')
+
+        # page through with cursors round tripped through json
+        rows: List[List[Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = get_page(cursor=cursor, **query)
+            rows.extend(page)
+            if cursor is None:
+                break
+            cursor = json.loads(json.dumps(cursor))
+
+        if rows != brute_force_page_rows(university, kind, query):
+            raise AssertionError(f'Summary pages of {kind} differ from brute force rows for {query}.')
+
+
+def pages_path(directory: str, work_directory: str) -> Dict[str, Any]:
+    ''' page through summaries, checking random page queries on the way '''
+    university: University = University(directory)
+    # seed from data, so failures reproduce on the same dataset
+    check_page_queries(university, Random(len(university.attempts)))
+    return university_state(university, paged=True)
+
+
+def pretty_print_output(university: University) -> str:
+    ''' capture output of every pretty printed summary '''
+    output: StringIO = StringIO()
+    with redirect_stdout(output):
+        university.pretty_print_major_summary()
+        university.pretty_print_student_summary()
+        university.pretty_print_instructor_summary()
+
+    return output.getvalue()
+
+
+def university_state(university: University, paged: bool = False,
+                     transcripts: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    ''' comparable data of University, its summaries and transcripts '''
+    return {
+        'majors': {
+            name: (sorted(major.required_course_name_set), sorted(major.elective_course_name_set))
+            for name, major in university.majors.items()
+        },
+        'student_order': list(university.students),
+        'students': {
+            cwid: (student.name, student.major, student.courses_by_name,
+                   student.get_completed_course_names(), student.get_gpa_display())
+            for cwid, student in university.students.items()
+        },
+        'instructors': {
+            cwid: (instructor.name, instructor.department,
+                   sorted(instructor.course_name_set))
+            for cwid, instructor in university.instructors.items()
+        },
+        'courses': {
+            course_key: course.student_grades
+            for course_key, course in university.courses.items()
+        },
+        'attempts': [
+            [getattr(attempt, name) for name in GradeAttempt.__slots__] for attempt in university.attempts
+        ],
+        # summary rows and cells in exact order, as every column is deterministic
+        'major_summary': paged_rows(
+            university.get_major_summary_page, lambda row: (row[0],),
+            university.get_major_summary_rows()) if paged
+        else university.get_major_summary_rows(),
+        'student_summary': paged_rows(
+            university.get_student_summary_page, lambda row: (row[0],),
+            university.get_student_summary_rows()) if paged
+        else university.get_student_summary_rows(),
+        'instructor_summary': paged_rows(
+            university.get_instructor_summary_page, lambda row: (row[0], row[3]),
+            university.get_instructor_summary_rows()) if paged
+        else university.get_instructor_summary_rows(),
+        'pretty_print': pretty_print_output(university),
+        'transcripts': transcripts if transcripts is not None else {
+            cwid: render_transcript(student) for cwid, student in university.students.items()
+        },
+    }
+
+
+def compress_university(directory: str, work_directory: str) -> str:
+    ''' write gzip copies of existing data files, returning their directory '''
+    # leave invalid directory for University to report
+    if not isdir(directory):
+        return directory
+
+    for file_name in [University.MAJOR_FILE_NAME, University.STUDENT_FILE_NAME,
+                      University.INSTRUCTOR_FILE_NAME, University.GRADE_FILE_NAME]:
+        if not isfile(join(directory, file_name)):
+            continue
+
+        with open(join(directory, file_name), 'rb') as source, \
+                gzip.open(join(work_directory, f'{file_name}.gz'), 'wb') as target:
+            target.write(source.read())
+
+    return work_directory
+
+
+def repository_path(directory: str, work_directory: str) -> Dict[str, Any]:
+    ''' read a snapshot while a reload swaps in its replacement '''
+    repository: UniversityRepository = UniversityRepository(directory)
+    snapshot: University = repository.snapshot()
+
+    reloader: Thread = Thread(target=repository.reload)
+    reloader.start()
+    state: Dict[str, Any] = university_state(snapshot)
+    reloader.join()
+
+    # reload must publish a new snapshot and leave the held one intact
+    if repository.snapshot() is snapshot:
+        raise AssertionError('Reload did not publish a new snapshot.')
+    if university_state(snapshot) != state:
+        raise AssertionError('Held snapshot changed during reload.')
+    if university_state(repository.snapshot()) != state:
+        raise AssertionError('Reloaded snapshot differs from held snapshot.')
+
+    return state
+
+
+def binary_path(directory: str, work_directory: str) -> Dict[str, Any]:
+    ''' load through binary export and import '''
+    path: str = join(work_directory, 'university.bin')
+    University(directory).export_binary(path)
+    return university_state(University.import_binary(path))
+
+
+def transcripts_path(directory: str, work_directory: str) -> Dict[str, Any]:
+    ''' export transcripts through a process pool into an archive '''
+    university: University = University(directory)
+    path: str = join(work_directory, 'transcripts.zip')
+    university.export_transcripts(path, processes=2, batch_size=50)
+    with ZipFile(path) as archive:
+        transcripts: Dict[str, str] = {
+            name[:-len('.txt')]: archive.read(name).decode() for name in archive.namelist()
+        }
+
+    return university_state(university, transcripts=transcripts)
+
+
+# reference implementation and optimized paths producing University state
+REFERENCE_PATH: Callable[[str, str], Dict[str, Any]] = \
+    lambda directory, work_directory: university_state(University(directory))
+OPTIMIZED_PATHS: Dict[str, Callable[[str, str], Dict[str, Any]]] = {
+    'prefetch': lambda directory, work_directory: university_state(
+        University(directory, prefetch=True)),
+    'compressed': lambda directory, work_directory: university_state(
+        University(compress_university(directory, work_directory))),
+    'compressed prefetch': lambda directory, work_directory: university_state(
+        University(compress_university(directory, work_directory), prefetch=True)),
+    'binary': binary_path,
+    'repository': repository_path,
+    'pages': pages_path,
+    'transcripts': transcripts_path,
+}
+
+
+class DifferentialMismatch(Exception):
+    ''' custom exception of optimized path disagreeing with reference '''
+
+    def __init__(self, message, path_name):
+        super().__init__(message)
+        self.path_name = path_name
+
+
+def run_path(path: Callable[[str, str], Dict[str, Any]], directory: str) -> Tuple[Any, float]:
+    ''' run a path in a fresh work directory, returning state or error and seconds '''
+    with TemporaryDirectory() as work_directory:
+        start: float = perf_counter()
+        try:
+            result: Any = path(directory, work_directory)
+
+        # errors must match in type and message, wherever the path read from
+        # and whether the file read was compressed
+        except Exception as e:
+            message: str = f'{e}'.replace(
+                work_directory, '<directory>').replace(directory, '<directory>')
+            for extension in COMPRESSED_EXTENSIONS:
+                message = message.replace(f'.txt{extension}', '.txt')
+            result = (type(e).__name__, message)
+
+        return result, perf_counter() - start
+
+
+def run_differential(directory: str,
+                     paths: Optional[Dict[str, Callable[[str, str], Dict[str, Any]]]] = None) -> Dict[str, float]:
+    ''' check every optimized path against reference, returning seconds of each path '''
+    paths = OPTIMIZED_PATHS if paths is None else paths
+    expected, seconds = run_path(REFERENCE_PATH, directory)
+    timings: Dict[str, float] = {'reference': seconds}
+
+    for name, path in paths.items():
+        result, timings[name] = run_path(path, directory)
+        if result != expected:
+            # report differing parts of state
+            keys: List[str] = [key for key in expected if result[key] != expected[key]] \
+                if isinstance(result, dict) and isinstance(expected, dict) else []
+            raise DifferentialMismatch(
+                f'"{name}" differs from reference on "{directory}"'
+                + (f' in {", ".join(keys)}.' if keys else f': {result} != {expected}.'), name)
+
+    return timings
+
+
+def benchmark_differential(datasets: int = 10, students: int = 1000, seed: int = 0) -> Dict[str, float]:
+    ''' run differential tests on random universities, returning median seconds of each path '''
+    random: Random = Random(seed)
+    timings: Dict[str, List[float]] = {}
+    with TemporaryDirectory() as directory:
+        for index in range(datasets):
+            # every other dataset carries a random defect
+            generate_university(directory, random.randrange(1 << 32), students=students,
+                                defect=random.choice(DEFECTS) if index % 2 else None)
+            for name, seconds in run_differential(directory).items():
+                timings.setdefault(name, []).append(seconds)
+
+    return {name: median(seconds) for name, seconds in timings.items()}
+
+
+def main() -> None:
+    ''' run and print benchmarks '''
+    print('Process Startup (median seconds)')
+    for name, seconds in benchmark_startup().items():
+        print(f'{name}\t{seconds:.4f}')
+
+    print('Differential Load (median seconds)')
+    for name, seconds in benchmark_differential().items():
+        print(f'{name}\t{seconds:.4f}')
+
+
+if __name__ == "__main__":
+    main()
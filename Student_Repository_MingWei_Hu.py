@@ -7,12 +7,22 @@
 
 '''
 # Imports
-from datetime import datetime, timedelta
-from typing import Iterator, Tuple, List, Dict, Set, IO, Any, Callable, Optional
+# annotations are not evaluated at runtime, so typing is only imported by type checkers
+# and heavy modules (prettytable, threading, compression) are imported where used
+from __future__ import annotations
 from decimal import Decimal, ROUND_HALF_UP
-from os.path import abspath, basename, join, isdir, isfile
-from os import listdir
-from prettytable import PrettyTable
+from os.path import abspath, basename, dirname, join, isdir, isfile
+from os import cpu_count, listdir, makedirs
+from array import array
+from struct import Struct
+from sys import argv, byteorder, exit, getsizeof, stdout
+import mmap
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Tuple, List, Dict, Set, IO, Any, Callable, Optional, Union
+    from threading import Lock
+    from prettytable import PrettyTable
 
 
 # custom exception
@@ -25,11 +35,113 @@ class FileNotFound(Exception):
         self.path = path
 
 
-def file_reader(path: str, fields: int, sep: str = '\t', header: bool = False) -> Iterator[Tuple[str]]:
+# compressed variants of data files, checked in order after the plain file
+COMPRESSED_EXTENSIONS: Tuple[str] = ('.gz', '.bz2', '.xz')
+# lines per batch and batches in flight for background decompression
+PREFETCH_BATCH_SIZE: int = 4096
+PREFETCH_QUEUE_SIZE: int = 8
+
+
+def find_data_file(directory: str, file_name: str) -> Optional[str]:
+    ''' find path of file name or a compressed variant of it in directory '''
+    for extension in ('',) + COMPRESSED_EXTENSIONS:
+        path: str = join(directory, file_name + extension)
+        if isfile(path):
+            return path
+
+    return None
+
+
+def open_text(path: str) -> IO:
+    ''' open text file from path, decompressing as a stream by extension '''
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rt')
+    elif path.endswith('.bz2'):
+        import bz2
+        return bz2.open(path, 'rt')
+    elif path.endswith('.xz'):
+        import lzma
+        return lzma.open(path, 'rt')
+    else:
+        return open(path)
+
+
+def decompression_errors(path: str) -> Tuple[type]:
+    ''' exception types raised on truncated or corrupt data of compressed file from path '''
+    # bad headers of every format raise OSError, handled along with reading errors
+    if path.endswith('.gz'):
+        from zlib import error
+        return (EOFError, error)
+    elif path.endswith('.bz2'):
+        return (EOFError,)
+    elif path.endswith('.xz'):
+        from lzma import LZMAError
+        return (EOFError, LZMAError)
+    else:
+        return ()
+
+
+def prefetch_lines(file: IO, batch_size: int = PREFETCH_BATCH_SIZE) -> Iterator[str]:
+    ''' a generator yielding lines of file read in a background thread '''
+    from queue import Queue, Full
+    from threading import Thread, Event
+
+    batches: Queue = Queue(PREFETCH_QUEUE_SIZE)
+    stopped: Event = Event()
+
+    def put(item: Any) -> bool:
+        # give up once consumer stops so the thread never blocks forever
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+
+        return False
+
+    def produce() -> None:
+        try:
+            batch: List[str] = []
+            for line in file:
+                batch.append(line)
+                if len(batch) == batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+
+            # flush last batch and mark end of file
+            if put(batch):
+                put(None)
+
+        # hand read and decompression errors over to consumer
+        except Exception as e:
+            put(e)
+
+    thread: Thread = Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item: Any = batches.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            yield from item
+
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def file_reader(path: str, fields: int, sep: str = '\t', header: bool = False,
+                prefetch: bool = False) -> Iterator[Tuple[str]]:
     ''' a generator yielding lines of file from path '''
     # read file from path
     try:
-        file: IO = open(path)
+        file: IO = open_text(path)
 
     # handle file not found
     except FileNotFoundError:
@@ -37,25 +149,38 @@ def file_reader(path: str, fields: int, sep: str = '\t', header: bool = False) -
 
     # yield lines form a generator function
     with file:
-        # loop through file line sequence
-        line_no: int = 1
-        for line in file:
-            # remove change line and split by separator
-            values: List[str] = line.strip().split(sep)
-
-            # raise ValueError if fields count are incorrect
-            if len(values) != fields:
-                file_name: str = basename(path)
-                raise ValueError(
-                    f"'{file_name}' has {len(values)} fields on line {line_no} but expected {fields}")
+        # overlap reading and decompression with parsing if required
+        lines: Iterator[str] = prefetch_lines(file) if prefetch else file
+        try:
+            # loop through file line sequence
+            line_no: int = 1
+            for line in lines:
+                # remove change line and split by separator
+                values: List[str] = line.strip().split(sep)
+
+                # raise ValueError if fields count are incorrect
+                if len(values) != fields:
+                    file_name: str = basename(path)
+                    raise ValueError(
+                        f"'{file_name}' has {len(values)} fields on line {line_no} but expected {fields}")
+
+                # ignore header line if necessary
+                if line_no != 1 or not header:
+                    # transform List to Tuple
+                    yield tuple(values)
+
+                # increment line number
+                line_no += 1
 
-            # ignore header line if necessary
-            if line_no != 1 or not header:
-                # transform List to Tuple
-                yield tuple(values)
+        # handle unreadable, truncated or corrupt compressed file
+        except (OSError, *decompression_errors(path)) as e:
+            file_name = basename(path)
+            raise UniversityDataInvalid(f"Cannot read '{file_name}': {e}")
 
-            # increment line number
-            line_no += 1
+        # stop background reader before closing file
+        finally:
+            if prefetch:
+                lines.close()
 
 
 def exception_containment(func):
@@ -208,6 +333,86 @@ class Course:
         self.student_grades[student_cwid].append(letter_grade)
 
 
+class GradeAttempt:
+    ''' grade record of a student's attempt at a course section '''
+
+    # one per grade row, so avoid a __dict__ for each
+    __slots__ = ('sequence', 'student_cwid', 'course_name',
+                 'instructor_cwid', 'letter_grade', 'attempt')
+
+    def __init__(self, sequence: int, student_cwid: str, course_name: str,
+                 instructor_cwid: str, letter_grade: str, attempt: int) -> None:
+        ''' initialize object with grade record data '''
+        # position of grade record in chronological order of all records
+        self.sequence: int = sequence
+        self.student_cwid: str = student_cwid
+        self.course_name: str = course_name
+        self.instructor_cwid: str = instructor_cwid
+        self.letter_grade: str = letter_grade
+        # 1 for first attempt of student at course, across sections
+        self.attempt: int = attempt
+
+    def is_passing(self) -> bool:
+        ''' check if letter grade of attempt is passing '''
+        return LETTER_GRADE_VALUE[self.letter_grade] >= LETTER_GRADE_VALUE[LETTER_GRADE_MINIMUM]
+
+
+class GradeAttempts:
+    ''' grade attempts in chronological order, stored as rows of unsigned ints
+
+        GradeAttempt objects are created only when read, so loading
+        a University costs a few bytes per grade row
+    '''
+
+    # student row, course name, letter grade, instructor row, attempt of each grade row
+    WIDTH: int = 5
+
+    def __init__(self, student_cwids: List[str], instructor_cwids: List[str]) -> None:
+        ''' initialize empty attempts of students and instructors in row order '''
+        self.student_cwids: List[str] = student_cwids
+        self.instructor_cwids: List[str] = instructor_cwids
+        # course names and letter grades shared by every row
+        self.strings: List[str] = []
+        self.string_indexes: Dict[str, int] = {}
+        self.rows: array = array('I')
+
+    def __string_index(self, value: str) -> int:
+        ''' get index of string in shared strings, adding it if new '''
+        if value not in self.string_indexes:
+            self.string_indexes[value] = len(self.strings)
+            self.strings.append(value)
+
+        return self.string_indexes[value]
+
+    def append(self, student_row: int, course_name: str, letter_grade: str,
+               instructor_row: int, attempt: int) -> None:
+        ''' add the next attempt in chronological order '''
+        self.rows.extend((student_row, self.__string_index(course_name),
+                          self.__string_index(letter_grade), instructor_row, attempt))
+
+    def __len__(self) -> int:
+        return len(self.rows) // GradeAttempts.WIDTH
+
+    def __getitem__(self, sequence: int) -> GradeAttempt:
+        ''' create GradeAttempt of sequence '''
+        # normalize negative and raise IndexError on out of range sequence
+        sequence = range(len(self))[sequence]
+        student_row, course, letter_grade, instructor_row, attempt = \
+            self.rows[sequence * GradeAttempts.WIDTH:(sequence + 1) * GradeAttempts.WIDTH]
+        return GradeAttempt(sequence, self.student_cwids[student_row], self.strings[course],
+                            self.instructor_cwids[instructor_row], self.strings[letter_grade], attempt)
+
+    def __iter__(self) -> Iterator[GradeAttempt]:
+        for sequence in range(len(self)):
+            yield self[sequence]
+
+    def get_keys(self) -> Iterator[Tuple[str]]:
+        ''' a generator yielding (student cwid, course name, instructor cwid) of every attempt '''
+        for start in range(0, len(self.rows), GradeAttempts.WIDTH):
+            yield (self.student_cwids[self.rows[start]], self.strings[self.rows[start + 1]],
+                   self.instructor_cwids[self.rows[start + 3]])
+
+
 class Major:
     ''' major object for University '''
 
@@ -232,6 +437,156 @@ class Major:
         self.elective_course_name_set.add(course_name)
 
 
+# output buffer size for bulk transcript archive writes
+TRANSCRIPT_BUFFER_SIZE: int = 1 << 20
+
+
+def render_transcript(student: Student) -> str:
+    ''' render transcript text of student '''
+    lines: List[str] = [
+        f'CWID: {student.cwid}',
+        f'Name: {student.name}',
+        f'Major: {student.major}',
+        '',
+        'Course\tInstructor\tGrade',
+    ]
+    # every attempt of every course in recorded order
+    for course_name, course_records in student.courses_by_name.items():
+        for instructor_cwid, letter_grade in course_records:
+            lines.append(f'{course_name}\t{instructor_cwid}\t{letter_grade}')
+
+    lines.extend([
+        '',
+        f'Completed Courses: {", ".join(student.get_completed_course_names())}',
+        f'GPA: {student.get_gpa_display()}',
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def transcript_record(student: Student) -> Tuple:
+    ''' get plain (cwid, name, major, course records) tuple of student '''
+    return (student.cwid, student.name, student.major, [
+        (course_name, instructor_cwid, letter_grade)
+        for course_name, course_records in student.courses_by_name.items()
+        for instructor_cwid, letter_grade in course_records
+    ])
+
+
+def render_transcripts(records: List[Tuple]) -> List[Tuple[str, bytes]]:
+    ''' render (cwid, utf-8 transcript) pairs of a batch of transcript records '''
+    transcripts: List[Tuple[str, bytes]] = []
+    for cwid, name, major, course_records in records:
+        # rebuild Student from plain tuples sent to worker
+        student: Student = Student(cwid, name, major)
+        for course_name, instructor_cwid, letter_grade in course_records:
+            student.add_course(course_name, instructor_cwid, letter_grade)
+
+        transcripts.append((cwid, render_transcript(student).encode()))
+
+    return transcripts
+
+
+# binary format: header, section table, then 8-byte aligned sections of
+# native unsigned int rows and one utf-8 string blob
+BINARY_MAGIC: bytes = b'UNIV'
+BINARY_VERSION: int = 3
+# magic, version, little endian flag, unsigned int item size, section count
+BINARY_HEADER: Struct = Struct('<4sHBBI')
+BINARY_ITEM_SIZE: int = array('I').itemsize
+BINARY_SECTION_ENTRY: Struct = Struct('<QQ')
+BINARY_SECTIONS: Tuple[str] = (
+    'string_offsets',
+    'string_data',
+    'majors',
+    'major_courses',
+    'students',
+    'student_index',
+    'instructors',
+    'instructor_index',
+    'instructor_grades',
+    'grades',
+)
+# unsigned int fields per row of each table section
+BINARY_ROW_WIDTHS: Dict[str, int] = {
+    'majors': 3,
+    'major_courses': 2,
+    'students': 5,
+    'instructors': 5,
+    'grades': 5,
+}
+
+
+# default rows per summary page
+SUMMARY_PAGE_SIZE: int = 50
+
+# summary table field names
+MAJOR_SUMMARY_FIELDS: List[str] = [
+    'Major',
+    'Required Course',
+    'Electives',
+]
+STUDENT_SUMMARY_FIELDS: List[str] = [
+    'CWID',
+    'Name',
+    'Major',
+    'Completed Courses',
+    'Remaing Required',
+    'Remaing Electives',
+    'GPA',
+]
+INSTRUCTOR_SUMMARY_FIELDS: List[str] = [
+    'CWID',
+    'Name',
+    'Dept',
+    'Course',
+    'Students',
+]
+
+# named sort keys of summary pages, fixed functions so each name shares one index
+SUMMARY_SORT_KEYS: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+    'majors': {
+        'required': lambda major: len(major.required_course_name_set),
+        'electives': lambda major: len(major.elective_course_name_set),
+    },
+    'students': {
+        'name': lambda student: student.name,
+        'major': lambda student: student.major,
+        'gpa': lambda student: student.get_gpa(),
+    },
+    'instructors': {
+        'name': lambda instructor: instructor.name,
+        'department': lambda instructor: instructor.department,
+    },
+}
+# summary page indexes kept by each University, least recently used dropped first
+SUMMARY_INDEX_CACHE_SIZE: int = 8
+
+
+def summary_page(index: List[Tuple[Tuple, Any]], predicate: Optional[Callable[[Any], bool]],
+                 page_size: int, cursor: Optional[Tuple], low: int = 0,
+                 high: Optional[int] = None) -> Tuple[List[Any], Optional[Tuple]]:
+    ''' select a page of entities after cursor from a sorted (key, entity) index '''
+    from bisect import bisect_right
+
+    if page_size < 1:
+        raise ValueError(f'Page size must be positive but got {page_size}.')
+
+    # binary search first position after cursor, then scan only until page is full
+    high = len(index) if high is None else high
+    position: int = low if cursor is None else bisect_right(
+        index, cursor, low, high, key=lambda keyed_entity: keyed_entity[0])
+    page: List[Tuple[Tuple, Any]] = []
+    while position < high:
+        key, entity = index[position]
+        position += 1
+        if predicate is None or predicate(entity):
+            if len(page) == page_size:
+                return [entity for key, entity in page], page[-1][0]
+            page.append((key, entity))
+
+    return [entity for key, entity in page], None
+
+
 class UniversityFilesInvalid(Exception):
     ''' custom invalid files exception'''
 
@@ -255,31 +610,36 @@ class University:
     GRADE_FILE_NAME: str = "grades.txt"
     MAJOR_FILE_NAME: str = "majors.txt"
 
-    def __init__(self, directory: str) -> None:
+    def __init__(self, directory: str, prefetch: bool = False) -> None:
         ''' initialize object with data file directory '''
+        self.__init_data(abspath(directory), prefetch)
+
         # validate directory
-        self.directory: str = abspath(directory)
         if not isdir(self.directory):
             raise UniversityFilesInvalid(
                 f'"{directory}" is not a valid directory.')
 
+        # locate required files, plain or compressed
+        self.file_paths = {
+            file_name: find_data_file(self.directory, file_name)
+            for file_name in [
+                University.MAJOR_FILE_NAME,
+                University.STUDENT_FILE_NAME,
+                University.INSTRUCTOR_FILE_NAME,
+                University.GRADE_FILE_NAME,
+            ]
+        }
+
         # validate required files
-        missing_files = str = ", ".join([f'"{file_name}"' for file_name in [
-            University.MAJOR_FILE_NAME,
-            University.STUDENT_FILE_NAME,
-            University.INSTRUCTOR_FILE_NAME,
-            University.GRADE_FILE_NAME,
-        ] if not isfile(join(self.directory, file_name))])
+        missing_files = str = ", ".join([
+            f'"{file_name}"'
+            for file_name, path in self.file_paths.items()
+            if path is None
+        ])
         if missing_files:
             raise UniversityFilesInvalid(
                 f'{missing_files} does not exist in "{directory}".')
 
-        # data containers placeholders
-        self.major: Dict[str, Major] = {}
-        self.students: Dict[str, Student] = {}
-        self.instructors: Dict[str, Instructor] = {}
-        self.courses: Dict[Tuple[str], Course] = {}
-
         # read data from required files
         try:
             self.__parse_majors()
@@ -291,14 +651,37 @@ class University:
         except ValueError as e:
             raise UniversityDataInvalid(f'{e}')
 
+    def __init_data(self, directory: str, prefetch: bool) -> None:
+        ''' set up attributes with empty data containers '''
+        self.directory: str = directory
+        # decompress and read files in background threads if required
+        self.prefetch: bool = prefetch
+        # Dict[file name, path] of located data files
+        self.file_paths: Dict[str, Optional[str]] = {}
+
+        # data containers placeholders
+        self.majors: Dict[str, Major] = {}
+        self.students: Dict[str, Student] = {}
+        self.instructors: Dict[str, Instructor] = {}
+        self.courses: Dict[Tuple[str], Course] = {}
+        self.attempts: GradeAttempts = GradeAttempts([], [])
+        self.reset_indexes()
+
+    @classmethod
+    def empty(cls, directory: str) -> 'University':
+        ''' create University of directory with no data, without reading any file '''
+        university: University = cls.__new__(cls)
+        university.__init_data(abspath(directory), False)
+        return university
+
     def __parse_majors(self):
         ''' read data from majors.txt '''
 
         # temp Dict
         majors: Dict[str, Major] = {}
-        path = join(self.directory, University.MAJOR_FILE_NAME)
+        path = self.file_paths[University.MAJOR_FILE_NAME]
 
-        for data in file_reader(path, 3, header=True):
+        for data in file_reader(path, 3, header=True, prefetch=self.prefetch):
             if all(data):
                 # read data tuple from file reader generator
                 name, r_or_e, course_name = data
@@ -336,9 +719,9 @@ class University:
 
         # temp Dict
         students: Dict[str, Student] = {}
-        path = join(self.directory, University.STUDENT_FILE_NAME)
+        path = self.file_paths[University.STUDENT_FILE_NAME]
 
-        for data in file_reader(path, 3, ';', True):
+        for data in file_reader(path, 3, ';', True, prefetch=self.prefetch):
             if all(data):
                 # read data tuple from file reader generator
                 cwid, name, major_name = data
@@ -368,9 +751,9 @@ class University:
 
         # temp Dict
         instructors: Dict[str, Instructor] = {}
-        path = join(self.directory, University.INSTRUCTOR_FILE_NAME)
+        path = self.file_paths[University.INSTRUCTOR_FILE_NAME]
 
-        for data in file_reader(path, 3, '|', True):
+        for data in file_reader(path, 3, '|', True, prefetch=self.prefetch):
             if all(data):
                 # read data tuple from file reader generator
                 cwid, name, department = data
@@ -400,9 +783,15 @@ class University:
 
         # temp Dict
         courses: Dict[Tuple[str], Course] = {}
-        path = join(self.directory, University.GRADE_FILE_NAME)
-
-        for data in file_reader(path, 4, '|', True):
+        attempts: GradeAttempts = GradeAttempts(list(self.students), list(self.instructors))
+        # Dict[cwid, row] of students and instructors for compact attempt rows
+        student_rows: Dict[str, int] = {
+            cwid: row for row, cwid in enumerate(self.students)}
+        instructor_rows: Dict[str, int] = {
+            cwid: row for row, cwid in enumerate(self.instructors)}
+        path = self.file_paths[University.GRADE_FILE_NAME]
+
+        for data in file_reader(path, 4, '|', True, prefetch=self.prefetch):
             if all(data):
                 # read data tuple from file reader generator
                 student_cwid, course_name, letter_grade, instructor_cwid = data
@@ -428,9 +817,15 @@ class University:
                     student_cwid, letter_grade)
 
                 # udpate grade data of university student
-                self.students[student_cwid].add_course(
+                student: Student = self.students[student_cwid]
+                student.add_course(
                     course_name, instructor_cwid, letter_grade)
 
+                # record attempt in chronological order
+                attempts.append(
+                    student_rows[student_cwid], course_name, letter_grade,
+                    instructor_rows[instructor_cwid], len(student.courses_by_name[course_name]))
+
                 # udpate university instructor's instructed courses
                 self.instructors[instructor_cwid].add_course(course_name)
 
@@ -441,23 +836,543 @@ class University:
 
         # overwrite university course data with file data stored in temp
         self.courses = courses
+        self.attempts = attempts
+
+    def __ensure_attempt_index(self) -> None:
+        ''' build attempt index on first query '''
+        # assigned last by build_attempt_index, so set means all indexes are set
+        if self.attempts_by_course_student is None:
+            self.build_attempt_index()
+
+    def build_attempt_index(self) -> None:
+        ''' index attempt sequences by course, section and student in chronological order '''
+        attempts_by_course: Dict[str, array] = {}
+        attempts_by_section: Dict[Tuple[str], array] = {}
+        # Dict[course_name, Dict[student_cwid, sequences]] for retakes of a course
+        attempts_by_course_student: Dict[str, Dict[str, array]] = {}
+
+        for sequence, (student_cwid, course_name, instructor_cwid) in enumerate(self.attempts.get_keys()):
+            if course_name not in attempts_by_course_student:
+                attempts_by_course_student[course_name] = {}
+
+            for index, key in [
+                (attempts_by_course, course_name),
+                (attempts_by_section, (course_name, instructor_cwid)),
+                (attempts_by_course_student[course_name], student_cwid),
+            ]:
+                if key not in index:
+                    index[key] = array('I')
+
+                index[key].append(sequence)
+
+        self.attempts_by_course = attempts_by_course
+        self.attempts_by_section = attempts_by_section
+        self.attempts_by_course_student = attempts_by_course_student
+
+    def get_course_attempts(self, course_name: str, start: int = 0,
+                            stop: Optional[int] = None) -> List[GradeAttempt]:
+        ''' get attempts at course across sections with sequence in [start, stop) '''
+        from bisect import bisect_left
+
+        self.__ensure_attempt_index()
+        sequences: array = self.attempts_by_course.get(
+            course_name, array('I'))
+        # sequences are sorted, so find range by binary search
+        low: int = bisect_left(sequences, start)
+        high: int = len(sequences) if stop is None else bisect_left(
+            sequences, stop)
+        return [self.attempts[sequence] for sequence in sequences[low:high]]
+
+    def get_section_attempts(self, course_name: str, instructor_cwid: str) -> List[GradeAttempt]:
+        ''' get attempts at course section of instructor '''
+        self.__ensure_attempt_index()
+        return [self.attempts[sequence]
+                for sequence in self.attempts_by_section.get((course_name, instructor_cwid), [])]
+
+    def get_student_attempts(self, student_cwid: str, course_name: str) -> List[GradeAttempt]:
+        ''' get attempts of student at course '''
+        self.__ensure_attempt_index()
+        return [self.attempts[sequence]
+                for sequence in self.attempts_by_course_student.get(course_name, {}).get(student_cwid, [])]
+
+    def get_repeat_attempts(self, course_name: Optional[str] = None) -> List[List[GradeAttempt]]:
+        ''' get attempts of every student who took a course more than once '''
+        self.__ensure_attempt_index()
+        # only visit students of the given course
+        if course_name is None:
+            courses: List[Dict[str, array]] = list(
+                self.attempts_by_course_student.values())
+        else:
+            courses = [self.attempts_by_course_student.get(course_name, {})]
 
-    def pretty_print_major_summary(self):
-        ''' print out major summary in pretty table '''
-        field_names: List[str] = [
-            'Major',
-            'Required Course',
-            'Electives',
+        return [
+            [self.attempts[sequence] for sequence in sequences]
+            for sequences_by_student in courses
+            for sequences in sequences_by_student.values()
+            if len(sequences) > 1
         ]
-        pt: PrettyTable = PrettyTable(field_names=field_names)
 
-        # add rows from university instructors
+    def get_failed_then_passed(self, course_name: Optional[str] = None,
+                               different_instructor: bool = False) -> List[Tuple[GradeAttempt]]:
+        ''' get (last failed, first passed) attempts of students who retook to pass '''
+        retakes: List[Tuple[GradeAttempt]] = []
+        for attempts in self.get_repeat_attempts(course_name):
+            failed: Optional[GradeAttempt] = None
+            for attempt in attempts:
+                if not attempt.is_passing():
+                    failed = attempt
+                elif failed is not None:
+                    # optionally require passing with another instructor
+                    if not different_instructor or failed.instructor_cwid != attempt.instructor_cwid:
+                        retakes.append((failed, attempt))
+                    break
+
+        return retakes
+
+    def export_binary(self, path: str) -> None:
+        ''' write university data to a memory-mappable binary file '''
+        # string table Dict[string, index] shared by every section
+        strings: Dict[str, int] = {}
+
+        def string_index(value: str) -> int:
+            if value not in strings:
+                strings[value] = len(strings)
+            return strings[value]
+
+        # row numbers of entities in section order
+        major_rows: Dict[str, int] = {
+            name: row for row, name in enumerate(self.majors)}
+        instructor_rows: Dict[str, int] = {
+            cwid: row for row, cwid in enumerate(self.instructors)}
+
+        sections: Dict[str, array] = {
+            name: array('I') for name in BINARY_SECTIONS if name != 'string_data'}
+
+        # majors with their required and elective course rows
         for name, major in self.majors.items():
-            pt.add_row([
-                name,
-                sorted(major.required_course_name_set),
-                sorted(major.elective_course_name_set),
-            ])
+            major_courses: array = sections['major_courses']
+            sections['majors'].extend(
+                (string_index(name), len(major_courses) // 2,
+                 len(major.required_course_name_set) + len(major.elective_course_name_set)))
+            for course_name in sorted(major.required_course_name_set):
+                major_courses.extend((0, string_index(course_name)))
+            for course_name in sorted(major.elective_course_name_set):
+                major_courses.extend((1, string_index(course_name)))
+
+        # students with grade rows grouped by student in attempt order
+        instructor_grade_rows: Dict[str, List[int]] = {
+            cwid: [] for cwid in self.instructors}
+        self.__ensure_attempt_index()
+        grade_width: int = BINARY_ROW_WIDTHS['grades']
+        for row, (cwid, student) in enumerate(self.students.items()):
+            grades: array = sections['grades']
+            grade_start: int = len(grades) // grade_width
+            for course_name in student.courses_by_name:
+                for sequence in self.attempts_by_course_student[course_name][cwid]:
+                    attempt: GradeAttempt = self.attempts[sequence]
+                    instructor_grade_rows[attempt.instructor_cwid].append(
+                        len(grades) // grade_width)
+                    grades.extend((row, string_index(course_name), string_index(attempt.letter_grade),
+                                   instructor_rows[attempt.instructor_cwid], attempt.sequence))
+
+            sections['students'].extend(
+                (string_index(cwid), string_index(student.name), major_rows[student.major],
+                 grade_start, len(grades) // grade_width - grade_start))
+
+        # instructors with grade rows grouped by instructor
+        for cwid, instructor in self.instructors.items():
+            instructor_grades: array = sections['instructor_grades']
+            sections['instructors'].extend(
+                (string_index(cwid), string_index(instructor.name), major_rows[instructor.department],
+                 len(instructor_grades), len(instructor_grade_rows[cwid])))
+            instructor_grades.extend(instructor_grade_rows[cwid])
+
+        # encode string table as offsets into one utf-8 blob
+        encoded: List[bytes] = [value.encode() for value in strings]
+        string_data: bytes = b''.join(encoded)
+        string_offsets: array = sections['string_offsets']
+        string_offsets.append(0)
+        for value in encoded:
+            string_offsets.append(string_offsets[-1] + len(value))
+
+        # sorted row indexes for binary search lookups by cwid
+        sections['student_index'].extend(sorted(
+            range(len(self.students)), key=lambda row: encoded[sections['students'][row * 5]]))
+        sections['instructor_index'].extend(sorted(
+            range(len(self.instructors)), key=lambda row: encoded[sections['instructors'][row * 5]]))
+
+        # lay out 8-byte aligned sections after the header
+        payloads: List[bytes] = [
+            string_data if name == 'string_data' else sections[name].tobytes()
+            for name in BINARY_SECTIONS
+        ]
+        offset: int = BINARY_HEADER.size + \
+            BINARY_SECTION_ENTRY.size * len(BINARY_SECTIONS)
+        entries: List[Tuple[int]] = []
+        for payload in payloads:
+            offset += -offset % 8
+            entries.append((offset, len(payload)))
+            offset += len(payload)
+
+        with open(path, 'wb') as file:
+            file.write(BINARY_HEADER.pack(
+                BINARY_MAGIC, BINARY_VERSION, byteorder == 'little', BINARY_ITEM_SIZE,
+                len(BINARY_SECTIONS)))
+            for entry in entries:
+                file.write(BINARY_SECTION_ENTRY.pack(*entry))
+            for (offset, size), payload in zip(entries, payloads):
+                file.write(b'\0' * (offset - file.tell()))
+                file.write(payload)
+
+    @staticmethod
+    def import_binary(path: str) -> 'University':
+        ''' create University from a binary file written by export_binary '''
+        with MappedUniversity(path) as mapped:
+            return mapped.to_university()
+
+    @staticmethod
+    def open_binary(path: str) -> 'MappedUniversity':
+        ''' open a binary file for zero-copy lookups '''
+        return MappedUniversity(path)
+
+    def export_transcripts(self, output: str, processes: Optional[int] = None,
+                           shards: int = 0, batch_size: int = 1000) -> int:
+        ''' write a transcript file of every student, returning the count '''
+        from concurrent.futures import ProcessPoolExecutor
+        from zlib import crc32
+        from zipfile import ZipFile
+
+        def transcript_path(cwid: str) -> str:
+            # spread files over shard directories by stable hash of cwid
+            file_name: str = f'{cwid}.txt'
+            return f'{crc32(cwid.encode()) % shards:04d}/{file_name}' if shards else file_name
+
+        # render plain student records in batches, pickling no object graphs
+        records: List[Tuple] = [
+            transcript_record(student) for student in self.students.values()]
+        batches: List[List[Tuple]] = [
+            records[start:start + batch_size]
+            for start in range(0, len(records), batch_size)
+        ]
+
+        # use a process pool only if more than one cpu is available
+        if processes is None:
+            processes = cpu_count() or 1
+        executor: Optional[ProcessPoolExecutor] = None
+        if processes > 1:
+            executor = ProcessPoolExecutor(processes)
+            rendered: Iterator[List[Tuple[str, bytes]]] = executor.map(
+                render_transcripts, batches)
+        else:
+            rendered = map(render_transcripts, batches)
+
+        count: int = 0
+        try:
+            # write into a single zip archive
+            if output.endswith('.zip'):
+                with open(output, 'wb', buffering=TRANSCRIPT_BUFFER_SIZE) as file, \
+                        ZipFile(file, 'w') as archive:
+                    for transcripts in rendered:
+                        for cwid, transcript in transcripts:
+                            archive.writestr(transcript_path(cwid), transcript)
+                            count += 1
+
+            # write into (sharded) directories
+            else:
+                makedirs(output, exist_ok=True)
+                for shard in range(shards):
+                    makedirs(join(output, f'{shard:04d}'), exist_ok=True)
+
+                # one unbuffered write of whole encoded transcript per file
+                for transcripts in rendered:
+                    for cwid, transcript in transcripts:
+                        with open(join(output, transcript_path(cwid)), 'wb', buffering=0) as file:
+                            file.write(transcript)
+                        count += 1
+
+        finally:
+            if executor:
+                executor.shutdown()
+
+        return count
+
+    def get_memory_report(self) -> 'MemoryReport':
+        ''' measure deep byte counts of university data by entity type '''
+        report: MemoryReport = MemoryReport()
+        # objects already counted, so shared objects count only once
+        seen: Set[int] = set()
+
+        # count grade lists and record tuples first so entities exclude them
+        grade_containers: List[Any] = []
+        for student in self.students.values():
+            grade_containers.extend(student.courses_by_name.values())
+            report.grade_rows += sum(len(course_records)
+                                     for course_records in student.courses_by_name.values())
+        for course in self.courses.values():
+            grade_containers.extend(course.student_grades.values())
+        report.entity_counts['grades'] = report.grade_rows
+        report.entity_bytes['grades'] = deep_sizeof(grade_containers, seen) \
+            - getsizeof(grade_containers)
+
+        for entity_type, entities in [
+            ('Major', self.majors),
+            ('Student', self.students),
+            ('Instructor', self.instructors),
+            ('Course', self.courses),
+        ]:
+            report.entity_counts[entity_type] = len(entities)
+            report.entity_bytes[entity_type] = deep_sizeof(entities, seen)
+
+        # attempts with their indexes, if built
+        attempt_containers: List[Any] = [
+            self.attempts, self.attempts_by_course, self.attempts_by_section, self.attempts_by_course_student]
+        attempt_containers = [
+            container for container in attempt_containers if container is not None]
+        report.entity_counts['GradeAttempt'] = len(self.attempts)
+        report.entity_bytes['GradeAttempt'] = deep_sizeof(attempt_containers, seen) \
+            - getsizeof(attempt_containers)
+
+        return report
+
+    def get_major_summary_rows(self) -> List[List[Any]]:
+        ''' get major summary rows '''
+        return [self.get_major_summary_row(major) for major in self.majors.values()]
+
+    def get_student_summary_rows(self) -> List[List[Any]]:
+        ''' get student summary rows '''
+        return [self.get_student_summary_row(student) for student in self.students.values()]
+
+    def get_instructor_summary_rows(self) -> List[List[Any]]:
+        ''' get instructor summary rows, one for each instructed course '''
+        return [
+            self.get_instructor_summary_row(instructor, course_name)
+            for instructor in self.instructors.values()
+            for course_name in sorted(instructor.course_name_set)
+        ]
+
+    def reset_indexes(self) -> None:
+        ''' drop indexes built on demand from university data '''
+        # Dict[(kind, group, sort key), sorted (key, entity) index] for summary pages,
+        # in order of least to most recently used
+        self.summary_indexes: Dict[Tuple, List[Tuple[Tuple, Any]]] = {}
+        # attempt sequence indexes, built by first attempt query
+        self.attempts_by_course: Optional[Dict[str, array]] = None
+        self.attempts_by_section: Optional[Dict[Tuple[str], array]] = None
+        self.attempts_by_course_student: Optional[Dict[str, Dict[str, array]]] = None
+
+    def __summary_index(self, kind: str, group: Optional[str],
+                        sort_key: Optional[Union[str, Callable[[Any], Any]]]) -> List[Tuple[Tuple, Any]]:
+        ''' get sorted (key, entity) index of summary kind, cached per group and sort key '''
+        index_key: Tuple = (kind, group, sort_key)
+        # pop and reinsert, so dict order runs from least to most recently used
+        index: Optional[List[Tuple[Tuple, Any]]] = self.summary_indexes.pop(index_key, None)
+        if index is None:
+            sort_function: Optional[Callable[[Any], Any]] = self.__sort_function(kind, sort_key)
+            # entities with unique identity keys, and the entity sort key applies to
+            if kind == 'majors':
+                keyed: List[Tuple[Tuple, Any, Any]] = [
+                    ((major.name,), major, major) for major in self.majors.values()]
+            elif kind == 'students':
+                keyed = [
+                    ((student.cwid,), student, student)
+                    for student in self.students.values()
+                    if group is None or student.major == group
+                ]
+            else:
+                keyed = [
+                    ((instructor.cwid, course_name), (instructor, course_name), instructor)
+                    for instructor in self.instructors.values()
+                    if group is None or instructor.department == group
+                    for course_name in instructor.course_name_set
+                ]
+
+            # order by sort key then unique identity, so cursors never skip rows
+            index = sorted([
+                (identity if sort_function is None else (sort_function(sorted_by),) + identity, entity)
+                for identity, entity, sorted_by in keyed
+            ], key=lambda keyed_entity: keyed_entity[0])
+
+        self.summary_indexes[index_key] = index
+        # drop least recently used indexes, e.g. of a new sort key callable on every call
+        while len(self.summary_indexes) > SUMMARY_INDEX_CACHE_SIZE:
+            self.summary_indexes.pop(next(iter(self.summary_indexes)), None)
+
+        return index
+
+    @staticmethod
+    def __sort_function(kind: str, sort_key: Optional[Union[str, Callable[[Any], Any]]]) \
+            -> Optional[Callable[[Any], Any]]:
+        ''' get function of named or callable sort key of summary kind '''
+        if isinstance(sort_key, str):
+            if sort_key not in SUMMARY_SORT_KEYS[kind]:
+                raise ValueError(
+                    f'Unknown sort key {sort_key} of {kind}, expected one of {", ".join(SUMMARY_SORT_KEYS[kind])}.')
+            return SUMMARY_SORT_KEYS[kind][sort_key]
+
+        return sort_key
+
+    def warm_summary_indexes(self, index_keys: List[Tuple]) -> None:
+        ''' build summary indexes of (kind, group, sort key) ahead of the first page '''
+        for kind, group, sort_key in index_keys[-SUMMARY_INDEX_CACHE_SIZE:]:
+            self.__summary_index(kind, group, sort_key)
+
+    def __summary_page(self, kind: str, group: Optional[str], cwid_prefix: str,
+                       predicate: Optional[Callable[[Any], bool]],
+                       sort_key: Optional[Union[str, Callable[[Any], Any]]], page_size: int,
+                       cursor: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+        ''' get a page of entities of summary kind and cursor of the next page '''
+        from bisect import bisect_left
+        import json
+
+        index: List[Tuple[Tuple, Any]] = self.__summary_index(
+            kind, group, sort_key)
+        sort_function: Optional[Callable[[Any], Any]] = self.__sort_function(kind, sort_key)
+
+        # cursor holds identity of last row only, so look up its current sort key
+        cursor_key: Optional[Tuple] = None
+        if cursor is not None:
+            try:
+                identity: Tuple = tuple(json.loads(cursor))
+                entities: Dict[str, Any] = self.majors if kind == 'majors' \
+                    else self.students if kind == 'students' else self.instructors
+                cursor_key = identity if sort_function is None \
+                    else (sort_function(entities[identity[0]]),) + identity
+
+            # handle malformed cursor or cursor of an entity no longer in university
+            except (ValueError, TypeError, IndexError, KeyError):
+                raise ValueError(f'Invalid cursor {cursor}.')
+
+        low, high = 0, len(index)
+        if cwid_prefix and sort_function is None:
+            # identity order keeps cwids of prefix together, so bound them by binary search
+            low = bisect_left(index, (cwid_prefix,),
+                              key=lambda keyed_entity: keyed_entity[0])
+            high = bisect_left(index, (cwid_prefix + chr(0x10ffff),),
+                               key=lambda keyed_entity: keyed_entity[0])
+        # otherwise check cwid prefix along with predicate while scanning
+        elif cwid_prefix:
+            entity_predicate: Optional[Callable[[Any], bool]] = predicate
+
+            def predicate(entity: Any) -> bool:
+                cwid: str = entity[0].cwid if kind == 'instructors' else entity.cwid
+                return cwid.startswith(cwid_prefix) \
+                    and (entity_predicate is None or entity_predicate(entity))
+
+        page, next_key = summary_page(index, predicate, page_size, cursor_key, low, high)
+        # opaque json string cursor of identity strings, with sort key removed
+        next_cursor: Optional[str] = None if next_key is None else json.dumps(
+            list(next_key if sort_function is None else next_key[1:]))
+        return page, next_cursor
+
+    def get_major_summary_page(self, predicate: Optional[Callable[[Major], bool]] = None,
+                               sort_key: Optional[Union[str, Callable[[Major], Any]]] = None,
+                               page_size: int = SUMMARY_PAGE_SIZE,
+                               cursor: Optional[str] = None) -> Tuple[List[List[Any]], Optional[str]]:
+        ''' get a page of major summary rows and cursor of the next page
+
+            sort key is a name of SUMMARY_SORT_KEYS or a callable, and only the
+            latest indexes are cached, so a new callable on every page sorts again
+        '''
+        page, next_cursor = self.__summary_page(
+            'majors', None, '', predicate, sort_key, page_size, cursor)
+        return [self.get_major_summary_row(major) for major in page], next_cursor
+
+    def get_student_summary_page(self, major: Optional[str] = None, cwid_prefix: str = '',
+                                 predicate: Optional[Callable[[Student], bool]] = None,
+                                 sort_key: Optional[Union[str, Callable[[Student], Any]]] = None,
+                                 page_size: int = SUMMARY_PAGE_SIZE,
+                                 cursor: Optional[str] = None) -> Tuple[List[List[Any]], Optional[str]]:
+        ''' get a page of student summary rows and cursor of the next page
+
+            sort key is a name of SUMMARY_SORT_KEYS or a callable, and only the
+            latest indexes are cached, so a new callable on every page sorts again
+        '''
+        page, next_cursor = self.__summary_page(
+            'students', major, cwid_prefix, predicate, sort_key, page_size, cursor)
+        return [self.get_student_summary_row(student) for student in page], next_cursor
+
+    def get_instructor_summary_page(self, department: Optional[str] = None, cwid_prefix: str = '',
+                                    predicate: Optional[Callable[[Instructor], bool]] = None,
+                                    sort_key: Optional[Union[str, Callable[[Instructor], Any]]] = None,
+                                    page_size: int = SUMMARY_PAGE_SIZE,
+                                    cursor: Optional[str] = None) -> Tuple[List[List[Any]], Optional[str]]:
+        ''' get a page of instructor summary rows and cursor of the next page
+
+            sort key is a name of SUMMARY_SORT_KEYS or a callable, and only the
+            latest indexes are cached, so a new callable on every page sorts again
+        '''
+        page, next_cursor = self.__summary_page(
+            'instructors', department, cwid_prefix,
+            None if predicate is None else lambda instructed_course: predicate(
+                instructed_course[0]),
+            sort_key, page_size, cursor)
+        return [
+            self.get_instructor_summary_row(instructor, course_name)
+            for instructor, course_name in page
+        ], next_cursor
+
+    def get_major_summary_row(self, major: Major) -> List[Any]:
+        ''' get summary row of major '''
+        return [
+            major.name,
+            sorted(major.required_course_name_set),
+            sorted(major.elective_course_name_set),
+        ]
+
+    def get_student_summary_row(self, student: Student) -> List[Any]:
+        ''' get summary row of student '''
+        # get major object of student
+        major: Major = self.majors[student.major]
+        # get sorted course names from Student
+        completed_courses: List[str] = student.get_completed_course_names()
+        # check if any elective completed
+        elective_done: bool = any([
+            course_name in major.elective_course_name_set
+            for course_name in completed_courses
+        ])
+
+        return [
+            student.cwid,
+            student.name,
+            major.name,
+            completed_courses,
+            # filter major courses by checking if course is completed
+            [
+                course_name
+                for course_name in sorted(major.required_course_name_set)
+                if not student.is_course_completed(course_name)
+            ],
+            # [] if no more elective required to graduate
+            [] if elective_done else [
+                course_name
+                for course_name in sorted(major.elective_course_name_set)
+                if not student.is_course_completed(course_name)
+            ],
+            student.get_gpa_display()
+        ]
+
+    def get_instructor_summary_row(self, instructor: Instructor, course_name: str) -> List[Any]:
+        ''' get summary row of an instructed course '''
+        # get Course from university courses
+        course: Course = self.courses[(course_name, instructor.cwid)]
+        return [
+            instructor.cwid,
+            instructor.name,
+            instructor.department,
+            course_name,
+            # count students by course grades Dict
+            len(course.student_grades.keys()),
+        ]
+
+    def pretty_print_major_summary(self):
+        ''' print out major summary in pretty table '''
+        from prettytable import PrettyTable
+
+        pt: PrettyTable = PrettyTable(field_names=MAJOR_SUMMARY_FIELDS)
+
+        # add rows from university majors
+        for row in self.get_major_summary_rows():
+            pt.add_row(row)
 
         # print
         print('Major Summary')
@@ -465,48 +1380,13 @@ class University:
 
     def pretty_print_student_summary(self):
         ''' print out student summary in pretty table '''
-        field_names: List[str] = [
-            'CWID',
-            'Name',
-            'Major',
-            'Completed Courses',
-            'Remaing Required',
-            'Remaing Electives',
-            'GPA',
-        ]
-        pt: PrettyTable = PrettyTable(field_names=field_names)
+        from prettytable import PrettyTable
+
+        pt: PrettyTable = PrettyTable(field_names=STUDENT_SUMMARY_FIELDS)
 
         # add rows from university students
-        for cwid, student in self.students.items():
-            # get major object of student
-            major: Major = self.majors[student.major]
-            # get sorted course names from Student
-            completed_courses: List[str] = student.get_completed_course_names()
-            # check if any elective completed
-            elective_done: bool = any([
-                course_name in major.elective_course_name_set
-                for course_name in completed_courses
-            ])
-
-            pt.add_row([
-                cwid,
-                student.name,
-                major.name,
-                completed_courses,
-                # filter major courses by checking if course is completed
-                [
-                    course_name
-                    for course_name in major.required_course_name_set
-                    if not student.is_course_completed(course_name)
-                ],
-                # [] if no more elective required to graduate
-                [] if elective_done else [
-                    course_name
-                    for course_name in major.elective_course_name_set
-                    if not student.is_course_completed(course_name)
-                ],
-                student.get_gpa_display()
-            ])
+        for row in self.get_student_summary_rows():
+            pt.add_row(row)
 
         # print
         print('Student Summary')
@@ -514,35 +1394,453 @@ class University:
 
     def pretty_print_instructor_summary(self):
         ''' print out instructor summary in pretty table '''
-        field_names: List[str] = [
-            'CWID',
-            'Name',
-            'Dept',
-            'Course',
-            'Students',
-        ]
-        pt: PrettyTable = PrettyTable(field_names=field_names)
+        from prettytable import PrettyTable
+
+        pt: PrettyTable = PrettyTable(field_names=INSTRUCTOR_SUMMARY_FIELDS)
 
         # add rows from university instructors
-        for cwid, instructor in self.instructors.items():
-            # add a row for each instructed course
-            for course_name in instructor.course_name_set:
-                # get Course from university courses
-                course: Course = self.courses[(course_name, cwid)]
-                pt.add_row([
-                    cwid,
-                    instructor.name,
-                    instructor.department,
-                    course_name,
-                    # count students by course grades Dict
-                    len(course.student_grades.keys()),
-                ])
+        for row in self.get_instructor_summary_rows():
+            pt.add_row(row)
 
         # print
         print('Instructor Summary')
         print(pt)
 
 
+class MappedUniversity:
+    ''' read-only university data over a memory-mapped binary file '''
+
+    def __init__(self, path: str) -> None:
+        ''' map binary file written by University.export_binary '''
+        self.path: str = abspath(path)
+        try:
+            file: IO = open(self.path, 'rb')
+
+        # handle file not found
+        except FileNotFoundError:
+            raise FileNotFound(f'Cannot open file from "{path}"!', path)
+
+        with file:
+            try:
+                self.__mmap: mmap.mmap = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # handle empty file
+            except ValueError:
+                raise UniversityFilesInvalid(
+                    f'"{path}" is not a valid university binary file.')
+
+        # validate header and section table before creating any views
+        try:
+            entries: Dict[str, Tuple[int]] = self.__read_section_table(path)
+
+        except UniversityFilesInvalid:
+            self.__mmap.close()
+            raise
+
+        # zero-copy views of every section
+        self.__view: memoryview = memoryview(self.__mmap)
+        self.__sections: Dict[str, memoryview] = {}
+        for name, (offset, size) in entries.items():
+            section: memoryview = self.__view[offset:offset + size]
+            if name != 'string_data':
+                # release byte view once cast, so closing never finds it exported
+                with section:
+                    section = section.cast('I')
+            self.__sections[name] = section
+
+        # handle string offsets past the string blob and references past their tables
+        if self.__sections['string_offsets'][-1] != len(self.__sections['string_data']) \
+                or not self.__references_valid():
+            self.close()
+            raise UniversityFilesInvalid(
+                f'Inconsistent sections in "{path}".')
+
+    def __read_section_table(self, path: str) -> Dict[str, Tuple[int]]:
+        ''' read (offset, size) of sections, checking them against the file '''
+        header_size: int = BINARY_HEADER.size + \
+            BINARY_SECTION_ENTRY.size * len(BINARY_SECTIONS)
+        if len(self.__mmap) < header_size:
+            raise UniversityFilesInvalid(
+                f'"{path}" is not a valid university binary file.')
+
+        magic, version, little_endian, item_size, section_count = BINARY_HEADER.unpack_from(
+            self.__mmap)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION \
+                or section_count != len(BINARY_SECTIONS):
+            raise UniversityFilesInvalid(
+                f'"{path}" is not a valid university binary file.')
+
+        if bool(little_endian) != (byteorder == 'little') or item_size != BINARY_ITEM_SIZE:
+            raise UniversityFilesInvalid(
+                f'"{path}" was written on a host of different byte order or integer size.')
+
+        entries: Dict[str, Tuple[int]] = {}
+        for index, name in enumerate(BINARY_SECTIONS):
+            offset, size = BINARY_SECTION_ENTRY.unpack_from(
+                self.__mmap, BINARY_HEADER.size + BINARY_SECTION_ENTRY.size * index)
+            # handle truncated file or partial rows
+            if offset < header_size or offset + size > len(self.__mmap) \
+                    or (name != 'string_data' and size % BINARY_ITEM_SIZE) \
+                    or (name in BINARY_ROW_WIDTHS and size // BINARY_ITEM_SIZE % BINARY_ROW_WIDTHS[name]):
+                raise UniversityFilesInvalid(
+                    f'Invalid section {name} in "{path}".')
+
+            entries[name] = (offset, size)
+
+        # handle string table and indexes not matching their sections
+        item_counts: Dict[str, int] = {
+            name: size // BINARY_ITEM_SIZE for name, (offset, size) in entries.items()}
+        if item_counts['string_offsets'] < 1 \
+                or item_counts['student_index'] * BINARY_ROW_WIDTHS['students'] != item_counts['students'] \
+                or item_counts['instructor_index'] * BINARY_ROW_WIDTHS['instructors'] != item_counts['instructors'] \
+                or item_counts['instructor_grades'] * BINARY_ROW_WIDTHS['grades'] != item_counts['grades']:
+            raise UniversityFilesInvalid(
+                f'Inconsistent sections in "{path}".')
+
+        return entries
+
+    def __references_valid(self) -> bool:
+        ''' check every string index and row number against the section it refers to '''
+        string_count: int = len(self.__sections['string_offsets']) - 1
+        row_counts: Dict[str, int] = {
+            name: self.__count(name) for name in BINARY_ROW_WIDTHS}
+
+        # (section, field, exclusive limit) of references, index sections having one field
+        for section, field, limit in [
+            ('majors', 0, string_count),
+            ('major_courses', 1, string_count),
+            ('students', 0, string_count),
+            ('students', 1, string_count),
+            ('students', 2, row_counts['majors']),
+            ('student_index', 0, row_counts['students']),
+            ('instructors', 0, string_count),
+            ('instructors', 1, string_count),
+            ('instructors', 2, row_counts['majors']),
+            ('instructor_index', 0, row_counts['instructors']),
+            ('instructor_grades', 0, row_counts['grades']),
+            ('grades', 0, row_counts['students']),
+            ('grades', 1, string_count),
+            ('grades', 2, string_count),
+            ('grades', 3, row_counts['instructors']),
+        ]:
+            # release column views before returning, as the mapping cannot close while exported
+            with self.__sections[section][field::BINARY_ROW_WIDTHS.get(section, 1)] as column:
+                if max(column, default=-1) >= limit:
+                    return False
+
+        # (section, start field, count field, referenced rows) of row ranges
+        for section, start_field, count_field, limit in [
+            ('majors', 1, 2, row_counts['major_courses']),
+            ('students', 3, 4, row_counts['grades']),
+            ('instructors', 3, 4, len(self.__sections['instructor_grades'])),
+        ]:
+            width: int = BINARY_ROW_WIDTHS[section]
+            with self.__sections[section][start_field::width] as starts, \
+                    self.__sections[section][count_field::width] as counts:
+                if any(start + count > limit for start, count in zip(starts, counts)):
+                    return False
+
+        return True
+
+    def __enter__(self) -> 'MappedUniversity':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        ''' release section views and unmap file '''
+        for section in self.__sections.values():
+            section.release()
+        self.__sections = {}
+        self.__view.release()
+        self.__mmap.close()
+
+    def __string(self, index: int) -> str:
+        ''' decode string of index from string table '''
+        offsets: memoryview = self.__sections['string_offsets']
+        try:
+            return str(self.__sections['string_data'][offsets[index]:offsets[index + 1]], 'utf-8')
+
+        # handle corrupt string blob
+        except UnicodeDecodeError:
+            raise UniversityFilesInvalid(
+                f'Invalid string data in "{self.path}".')
+
+    def __field(self, section: str, row: int, field: int) -> int:
+        ''' read a field from a row of a table section '''
+        return self.__sections[section][row * BINARY_ROW_WIDTHS[section] + field]
+
+    def __count(self, section: str) -> int:
+        ''' count rows of a table section '''
+        return len(self.__sections[section]) // BINARY_ROW_WIDTHS[section]
+
+    def __find(self, section: str, cwid: str) -> Optional[int]:
+        ''' binary search row of cwid through sorted index of section '''
+        index: memoryview = self.__sections[f'{section[:-1]}_index']
+        offsets: memoryview = self.__sections['string_offsets']
+        data: memoryview = self.__sections['string_data']
+        key: bytes = cwid.encode()
+
+        low, high = 0, len(index)
+        while low < high:
+            middle: int = (low + high) // 2
+            string_index: int = self.__field(section, index[middle], 0)
+            start, end = offsets[string_index], offsets[string_index + 1]
+            value: bytes = data[start:end].tobytes()
+            if value < key:
+                low = middle + 1
+            elif value > key:
+                high = middle
+            else:
+                return index[middle]
+
+        return None
+
+    def __major(self, row: int) -> Major:
+        ''' materialize Major of row '''
+        major: Major = Major(self.__string(self.__field('majors', row, 0)))
+        course_start: int = self.__field('majors', row, 1)
+        for course_row in range(course_start, course_start + self.__field('majors', row, 2)):
+            course_name: str = self.__string(
+                self.__field('major_courses', course_row, 1))
+            if self.__field('major_courses', course_row, 0) == 0:
+                major.add_required_course_name(course_name)
+            else:
+                major.add_elective_course_name(course_name)
+
+        return major
+
+    def __student(self, row: int) -> Student:
+        ''' materialize Student of row with course records '''
+        student: Student = Student(
+            self.__string(self.__field('students', row, 0)),
+            self.__string(self.__field('students', row, 1)),
+            self.__string(self.__field(
+                'majors', self.__field('students', row, 2), 0)),
+        )
+        grade_start: int = self.__field('students', row, 3)
+        for grade_row in range(grade_start, grade_start + self.__field('students', row, 4)):
+            student.add_course(
+                self.__string(self.__field('grades', grade_row, 1)),
+                self.__string(self.__field(
+                    'instructors', self.__field('grades', grade_row, 3), 0)),
+                self.__string(self.__field('grades', grade_row, 2)),
+            )
+
+        return student
+
+    def __instructor(self, row: int) -> Instructor:
+        ''' materialize Instructor of row with instructed courses '''
+        instructor: Instructor = Instructor(
+            self.__string(self.__field('instructors', row, 0)),
+            self.__string(self.__field('instructors', row, 1)),
+            self.__string(self.__field(
+                'majors', self.__field('instructors', row, 2), 0)),
+        )
+        instructor_grades: memoryview = self.__sections['instructor_grades']
+        grade_start: int = self.__field('instructors', row, 3)
+        for grade_row in instructor_grades[grade_start:grade_start + self.__field('instructors', row, 4)]:
+            instructor.add_course(self.__string(
+                self.__field('grades', grade_row, 1)))
+
+        return instructor
+
+    def get_major(self, name: str) -> Optional[Major]:
+        ''' look up major of name '''
+        for row in range(self.__count('majors')):
+            if self.__string(self.__field('majors', row, 0)) == name:
+                return self.__major(row)
+
+        return None
+
+    def get_student(self, cwid: str) -> Optional[Student]:
+        ''' look up student of cwid '''
+        row: Optional[int] = self.__find('students', cwid)
+        return None if row is None else self.__student(row)
+
+    def get_instructor(self, cwid: str) -> Optional[Instructor]:
+        ''' look up instructor of cwid '''
+        row: Optional[int] = self.__find('instructors', cwid)
+        return None if row is None else self.__instructor(row)
+
+    def to_university(self) -> University:
+        ''' materialize every entity into a University '''
+        university: University = University.empty(dirname(self.path))
+
+        for row in range(self.__count('majors')):
+            major: Major = self.__major(row)
+            university.majors[major.name] = major
+
+        for row in range(self.__count('students')):
+            student: Student = self.__student(row)
+            university.students[student.cwid] = student
+
+        for row in range(self.__count('instructors')):
+            instructor: Instructor = self.__instructor(row)
+            university.instructors[instructor.cwid] = instructor
+
+        # rebuild attempts in chronological order from grade rows
+        university.attempts = GradeAttempts(list(university.students), list(university.instructors))
+        attempt_counts: Dict[Tuple[int, str], int] = {}
+        grade_rows: List[int] = sorted(
+            range(self.__count('grades')), key=lambda row: self.__field('grades', row, 4))
+        for row in grade_rows:
+            student_row: int = self.__field('grades', row, 0)
+            course_name: str = self.__string(self.__field('grades', row, 1))
+            attempt_key: Tuple[int, str] = (student_row, course_name)
+            attempt_counts[attempt_key] = attempt_counts.get(attempt_key, 0) + 1
+            university.attempts.append(
+                student_row,
+                course_name,
+                self.__string(self.__field('grades', row, 2)),
+                self.__field('grades', row, 3),
+                attempt_counts[attempt_key],
+            )
+
+        # rebuild courses from attempts
+        for attempt in university.attempts:
+            course_key: Tuple[str] = (attempt.course_name, attempt.instructor_cwid)
+            if course_key not in university.courses:
+                university.courses[course_key] = Course(*course_key)
+
+            university.courses[course_key].add_letter_grade(
+                attempt.student_cwid, attempt.letter_grade)
+
+        return university
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    ''' get bytes of object and every object it references, each counted once '''
+    seen = set() if seen is None else seen
+    size: int = 0
+    stack: List[Any] = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += getsizeof(obj)
+        # follow references of containers and object attributes
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(vars(obj))
+            # slotted attributes live in the object itself, declared along the class hierarchy
+            for cls in type(obj).__mro__:
+                slots: Any = cls.__dict__.get('__slots__', ())
+                for name in [slots] if isinstance(slots, str) else slots:
+                    # private slot names are mangled like private attributes
+                    if name.startswith('__') and not name.endswith('__'):
+                        name = f'_{cls.__name__.lstrip("_")}{name}'
+                    if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+
+    return size
+
+
+class MemoryReport:
+    ''' memory accounting report of a University '''
+
+    def __init__(self) -> None:
+        ''' initialize empty report '''
+        # Dict[entity type, count] and Dict[entity type, deep bytes]
+        self.entity_counts: Dict[str, int] = {}
+        self.entity_bytes: Dict[str, int] = {}
+        self.grade_rows: int = 0
+        # (file:line, bytes) of top allocation sites while parsing if traced
+        self.top_allocations: List[Tuple[str, int]] = []
+
+    @property
+    def total_bytes(self) -> int:
+        ''' deep bytes of all entity types '''
+        return sum(self.entity_bytes.values())
+
+    @property
+    def bytes_per_grade_row(self) -> float:
+        ''' total bytes divided by grade rows '''
+        return self.total_bytes / self.grade_rows if self.grade_rows else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        ''' structured report for serialization '''
+        return {
+            'entity_counts': dict(self.entity_counts),
+            'entity_bytes': dict(self.entity_bytes),
+            'total_bytes': self.total_bytes,
+            'grade_rows': self.grade_rows,
+            'bytes_per_grade_row': self.bytes_per_grade_row,
+            'top_allocations': [list(allocation) for allocation in self.top_allocations],
+        }
+
+
+def profile_memory(directory: str, trace: bool = False, top: int = 10) -> MemoryReport:
+    ''' load University of directory and report its memory usage '''
+    if not trace:
+        return University(directory).get_memory_report()
+
+    import tracemalloc
+
+    # keep tracing running if it was started by caller
+    started: bool = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    try:
+        university: University = University(directory)
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ])
+
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    report: MemoryReport = university.get_memory_report()
+    report.top_allocations = [
+        (f'{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}', statistic.size)
+        for statistic in snapshot.statistics('lineno')[:top]
+    ]
+    return report
+
+
+class UniversityRepository:
+    ''' thread-safe University holder publishing reloads as snapshots '''
+
+    def __init__(self, directory: str, prefetch: bool = False) -> None:
+        ''' initialize repository with first snapshot of directory '''
+        self.directory: str = directory
+        self.prefetch: bool = prefetch
+        # serialize reloads only, readers never lock
+        from threading import Lock
+        self.__reload_lock: Lock = Lock()
+        self.__snapshot: University = University(directory, prefetch)
+
+    def snapshot(self) -> University:
+        ''' get current University, consistent for as long as it is held '''
+        return self.__snapshot
+
+    def reload(self, directory: Optional[str] = None) -> University:
+        ''' build a new University off to the side and publish it '''
+        with self.__reload_lock:
+            directory = directory if directory else self.directory
+            # current snapshot stays published if building fails
+            university: University = University(directory, self.prefetch)
+            # build summary indexes in use before publishing, so readers never pay for sorting
+            university.warm_summary_indexes(list(self.__snapshot.summary_indexes))
+            # publish with a single reference assignment
+            self.__snapshot = university
+            self.directory = directory
+
+        return university
+
+
 @exception_containment
 def prompt_university_repo(dir: str = '') -> University:
     ''' create and display university repository '''
@@ -564,5 +1862,118 @@ def main() -> None:
         prompt_university_repo()
 
 
+def format_value(value: Any) -> str:
+    ''' format a summary cell as a tab separated value '''
+    return ', '.join(value) if isinstance(value, list) else f'{value}'
+
+
+def print_rows(field_names: List[str], rows: List[List[Any]], output_format: str) -> None:
+    ''' print summary rows as tab separated values or json lines '''
+    if output_format == 'json':
+        import json
+        for row in rows:
+            print(json.dumps(dict(zip(field_names, row))))
+
+    else:
+        print('\t'.join(field_names))
+        for row in rows:
+            print('\t'.join([format_value(value) for value in row]))
+
+
+def cli(args: Optional[List[str]] = None) -> int:
+    ''' non-interactive command line entry point, returning exit status '''
+    from argparse import ArgumentParser
+    from sys import stderr
+
+    parser: ArgumentParser = ArgumentParser(
+        description='Data repository of courses, students, and instructors')
+    parser.add_argument('--format', dest='output_format', choices=['tsv', 'json'],
+                        default='tsv', help='output format (default: tsv)')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='read data files in background threads')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command, help_text in [
+        ('majors', 'print major summary'),
+        ('students', 'print student summary'),
+        ('instructors', 'print instructor summary'),
+        ('validate', 'validate university data'),
+    ]:
+        commands.add_parser(command, help=help_text).add_argument('directory')
+    for command, help_text in [
+        ('student', 'print summary of a student'),
+        ('instructor', 'print summary of an instructor'),
+    ]:
+        lookup = commands.add_parser(command, help=help_text)
+        lookup.add_argument('directory')
+        lookup.add_argument('cwid')
+    options = parser.parse_args(args)
+
+    try:
+        university: University = University(options.directory, options.prefetch)
+
+    # report invalid university as result of validate
+    except (UniversityFilesInvalid, UniversityDataInvalid) as e:
+        if options.command == 'validate':
+            print_rows(['Valid', 'Error'], [[False, f'{e}']],
+                       options.output_format)
+        else:
+            print(e, file=stderr)
+        return 1
+
+    if options.command == 'validate':
+        print_rows(['Valid', 'Error'], [[True, '']], options.output_format)
+
+    elif options.command == 'majors':
+        print_rows(MAJOR_SUMMARY_FIELDS, university.get_major_summary_rows(),
+                   options.output_format)
+
+    elif options.command == 'students':
+        print_rows(STUDENT_SUMMARY_FIELDS, university.get_student_summary_rows(),
+                   options.output_format)
+
+    elif options.command == 'instructors':
+        print_rows(INSTRUCTOR_SUMMARY_FIELDS, university.get_instructor_summary_rows(),
+                   options.output_format)
+
+    # look up rows of a single student or instructor
+    else:
+        if options.command == 'student' and options.cwid in university.students:
+            field_names: List[str] = STUDENT_SUMMARY_FIELDS
+            rows: List[List[Any]] = [university.get_student_summary_row(
+                university.students[options.cwid])]
+        elif options.command == 'instructor' and options.cwid in university.instructors:
+            instructor: Instructor = university.instructors[options.cwid]
+            field_names = INSTRUCTOR_SUMMARY_FIELDS
+            rows = [
+                university.get_instructor_summary_row(instructor, course_name)
+                for course_name in sorted(instructor.course_name_set)
+            ]
+
+        # handle unknown cwid
+        else:
+            print(f'Unknown {options.command} {options.cwid}.', file=stderr)
+            return 1
+
+        print_rows(field_names, rows, options.output_format)
+
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    # run command line if arguments given, otherwise prompt interactively
+    if len(argv) > 1:
+        try:
+            status: int = cli()
+            stdout.flush()
+
+        # handle reader of pipeline closing early, e.g. head
+        except BrokenPipeError:
+            # send remaining output to devnull so flushing at exit cannot fail again
+            import os
+            devnull: int = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, stdout.fileno())
+            status = 1
+
+        exit(status)
+    else:
+        main()
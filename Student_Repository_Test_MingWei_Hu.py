@@ -8,10 +8,31 @@
 """
 # imports
 from unittest import TestCase, main
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Optional, Callable
+from decimal import Decimal
+from tempfile import TemporaryDirectory
+from os.path import join, isfile
+from os import listdir
+from shutil import copy
+from zipfile import ZipFile
+import gzip
+import bz2
+import lzma
+from sys import getsizeof, executable
+from struct import pack_into
+from io import StringIO
+from contextlib import redirect_stdout, redirect_stderr
+from subprocess import run, Popen, PIPE
+import json
 
 from Student_Repository_MingWei_Hu import University, Student, Instructor, Course, Major
 from Student_Repository_MingWei_Hu import UniversityFilesInvalid, UniversityDataInvalid
+from Student_Repository_MingWei_Hu import MappedUniversity, UniversityRepository, prefetch_lines
+from Student_Repository_MingWei_Hu import render_transcript, render_transcripts, transcript_record, deep_sizeof, profile_memory, MemoryReport
+from Student_Repository_MingWei_Hu import BINARY_HEADER, BINARY_SECTION_ENTRY, BINARY_SECTIONS, BINARY_ITEM_SIZE
+from Student_Repository_MingWei_Hu import cli, GradeAttempt, GradeAttempts, SUMMARY_INDEX_CACHE_SIZE
+from Student_Repository_Benchmark_MingWei_Hu import generate_university, run_differential
+from Student_Repository_Benchmark_MingWei_Hu import DEFECTS, REFERENCE_PATH, DifferentialMismatch
 
 
 class StudentTest(TestCase):
@@ -292,6 +313,511 @@ class UniversityTest(TestCase):
         self.assertRaises(UniversityDataInvalid, University,
                           './test_suites/wrong_department_instructor_university')
 
+    def test_university_binary(self):
+        ''' testing University binary export and import '''
+        basic: University = University('./test_suites/basic_university')
+
+        with TemporaryDirectory() as directory:
+            path: str = join(directory, 'basic_university.bin')
+            basic.export_binary(path)
+
+            # test imported University against parsed University
+            imported: University = University.import_binary(path)
+            self.assertEqual(list(basic.majors), list(imported.majors))
+            self.assertEqual(list(basic.students), list(imported.students))
+            for name, major in basic.majors.items():
+                self.assertSetEqual(major.required_course_name_set,
+                                    imported.majors[name].required_course_name_set)
+                self.assertSetEqual(major.elective_course_name_set,
+                                    imported.majors[name].elective_course_name_set)
+            for cwid, student in basic.students.items():
+                self.assertDictEqual(student.courses_by_name,
+                                     imported.students[cwid].courses_by_name)
+            for cwid, instructor in basic.instructors.items():
+                self.assertSetEqual(instructor.course_name_set,
+                                    imported.instructors[cwid].course_name_set)
+            for course_key, course in basic.courses.items():
+                self.assertDictEqual(course.student_grades,
+                                     imported.courses[course_key].student_grades)
+
+            # test lookups on mapped file
+            with University.open_binary(path) as mapped:
+                student: Student = mapped.get_student('11658')
+                self.assertEqual('Kelly, P', student.name)
+                self.assertEqual('2.0', student.get_gpa_display())
+                self.assertSetEqual({'SSW 687', 'SSW 564', 'CS 501', 'CS 545'},
+                                    mapped.get_instructor('98764').course_name_set)
+                self.assertSetEqual({'SYS 671', 'SYS 612', 'SYS 800'},
+                                    mapped.get_major('SYEN').required_course_name_set)
+                self.assertIsNone(mapped.get_student('00000'))
+                self.assertIsNone(mapped.get_instructor('00000'))
+
+            # test invalid binary file
+            invalid_path: str = join(directory, 'invalid.bin')
+            with open(invalid_path, 'wb') as file:
+                file.write(b'not a university')
+            self.assertRaises(UniversityFilesInvalid,
+                              MappedUniversity, invalid_path)
+
+            # test truncated binary files
+            with open(path, 'rb') as file:
+                data: bytes = file.read()
+            for size in [200, 600, len(data) - 3, len(data) - 1]:
+                with open(invalid_path, 'wb') as file:
+                    file.write(data[:size])
+                self.assertRaises(UniversityFilesInvalid,
+                                  University.import_binary, invalid_path)
+
+            # test string indexes, row numbers and row ranges past their tables
+            for section, field in [('students', 1), ('students', 2), ('majors', 2),
+                                   ('instructor_grades', 0), ('grades', 3)]:
+                offset, size = BINARY_SECTION_ENTRY.unpack_from(
+                    data, BINARY_HEADER.size + BINARY_SECTION_ENTRY.size * BINARY_SECTIONS.index(section))
+                corrupt: bytearray = bytearray(data)
+                pack_into('=I', corrupt, offset + field * BINARY_ITEM_SIZE, 0xffffff)
+                with open(invalid_path, 'wb') as file:
+                    file.write(corrupt)
+                self.assertRaises(UniversityFilesInvalid,
+                                  University.import_binary, invalid_path)
+                self.assertRaises(UniversityFilesInvalid,
+                                  University.open_binary, invalid_path)
+
+    def test_university_compressed(self):
+        ''' testing University with compressed files '''
+        basic: University = University('./test_suites/basic_university')
+
+        with TemporaryDirectory() as directory:
+            # write each required file with a different compression
+            for file_name, module, extension in [
+                (University.MAJOR_FILE_NAME, gzip, '.gz'),
+                (University.STUDENT_FILE_NAME, bz2, '.bz2'),
+                (University.INSTRUCTOR_FILE_NAME, lzma, '.xz'),
+                (University.GRADE_FILE_NAME, gzip, '.gz'),
+            ]:
+                with open(join('./test_suites/basic_university', file_name), 'rb') as source, \
+                        module.open(join(directory, file_name + extension), 'wb') as target:
+                    target.write(source.read())
+
+            for prefetch in [False, True]:
+                compressed: University = University(directory, prefetch)
+                self.assertEqual(list(basic.students), list(compressed.students))
+                for cwid, student in basic.students.items():
+                    self.assertDictEqual(student.courses_by_name,
+                                         compressed.students[cwid].courses_by_name)
+
+        # test background reading in small batches
+        with open('./test_suites/basic_university/grades.txt') as file:
+            expected_lines: List[str] = file.readlines()
+        with open('./test_suites/basic_university/grades.txt') as file:
+            self.assertListEqual(expected_lines,
+                                 list(prefetch_lines(file, batch_size=5)))
+
+        # test truncated and corrupt compressed files, with and without background reading
+        with TemporaryDirectory() as directory:
+            for file_name in [University.MAJOR_FILE_NAME, University.STUDENT_FILE_NAME,
+                              University.INSTRUCTOR_FILE_NAME]:
+                copy(join('./test_suites/basic_university', file_name), directory)
+            with open('./test_suites/basic_university/grades.txt', 'rb') as file:
+                compressed: bytes = gzip.compress(file.read())
+
+            for data in [compressed[:len(compressed) // 2], compressed[:10] + bytes(len(compressed) - 10),
+                         b'not gzip data']:
+                with open(join(directory, 'grades.txt.gz'), 'wb') as file:
+                    file.write(data)
+                for prefetch in [False, True]:
+                    with self.assertRaisesRegex(UniversityDataInvalid, "'grades.txt.gz'"):
+                        University(directory, prefetch)
+
+                # report invalid university as result of validate
+                output: StringIO = StringIO()
+                with redirect_stdout(output):
+                    self.assertEqual(cli(['validate', directory]), 1)
+                self.assertTrue(output.getvalue().splitlines()[1].startswith('False\t'))
+
+        # test invalid data exceptions with background reading
+        self.assertRaises(UniversityDataInvalid, University,
+                          './test_suites/wrong_fields_grades_university', True)
+        self.assertRaises(UniversityFilesInvalid, University,
+                          './test_suites/incomplete_university', True)
+
+    def test_university_transcripts(self):
+        ''' testing University transcripts export '''
+        basic: University = University('./test_suites/basic_university')
+        expected_transcript: str = '\n'.join([
+            'CWID: 11658',
+            'Name: Kelly, P',
+            'Major: SYEN',
+            '',
+            'Course\tInstructor\tGrade',
+            'SSW 540\t98765\tF',
+            'SSW 540\t98765\tA',
+            '',
+            'Completed Courses: SSW 540',
+            'GPA: 2.0',
+        ]) + '\n'
+        self.assertEqual(expected_transcript,
+                         render_transcript(basic.students['11658']))
+        self.assertListEqual([('11658', expected_transcript.encode())],
+                             render_transcripts([transcript_record(basic.students['11658'])]))
+
+        with TemporaryDirectory() as directory:
+            # test serial and process pool exports to directories
+            for processes in [1, 2]:
+                output: str = join(directory, f'transcripts_{processes}')
+                self.assertEqual(10, basic.export_transcripts(
+                    output, processes, batch_size=3))
+                for cwid, student in basic.students.items():
+                    with open(join(output, f'{cwid}.txt')) as file:
+                        self.assertEqual(
+                            render_transcript(student), file.read())
+
+            # test sharded directories
+            output = join(directory, 'sharded')
+            self.assertEqual(10, basic.export_transcripts(
+                output, 1, shards=4))
+            self.assertEqual(10, sum(
+                isfile(join(output, f'{shard:04d}', f'{cwid}.txt'))
+                for shard in range(4)
+                for cwid in basic.students
+            ))
+
+            # test single archive
+            output = join(directory, 'transcripts.zip')
+            self.assertEqual(10, basic.export_transcripts(output, 1))
+            with ZipFile(output) as archive:
+                self.assertEqual(expected_transcript,
+                                 archive.read('11658.txt').decode())
+
+    def test_university_memory_report(self):
+        ''' testing University memory report '''
+        basic: University = University('./test_suites/basic_university')
+        report: MemoryReport = basic.get_memory_report()
+
+        expected_entity_counts: Dict[str, int] = {
+            'grades': 23,
+            'Major': 2,
+            'Student': 10,
+            'Instructor': 6,
+            'Course': 12,
+            'GradeAttempt': 23,
+        }
+        self.assertDictEqual(expected_entity_counts, report.entity_counts)
+        self.assertEqual(23, report.grade_rows)
+        for entity_type in expected_entity_counts:
+            self.assertGreater(report.entity_bytes[entity_type], 0)
+        self.assertEqual(sum(report.entity_bytes.values()), report.total_bytes)
+        self.assertEqual(report.total_bytes / 23, report.bytes_per_grade_row)
+        self.assertListEqual([], report.top_allocations)
+
+        # test shared objects are counted once
+        shared: List[str] = ['ABC 123']
+        outer: List[List[str]] = [shared, shared]
+        self.assertEqual(getsizeof(outer) + deep_sizeof(shared),
+                         deep_sizeof(outer))
+
+        # test attributes of slotted objects are followed
+        attempt: GradeAttempt = GradeAttempt(1000, 'ABC 123', 'SSW 540', 'XYZ 789', 'A', 1000)
+        self.assertEqual(getsizeof(attempt) + getsizeof(1000) + sum(getsizeof(value) for value in [
+            'ABC 123', 'SSW 540', 'XYZ 789', 'A']), deep_sizeof(attempt))
+
+        # test traced allocation sites
+        traced: MemoryReport = profile_memory(
+            './test_suites/basic_university', trace=True, top=3)
+        self.assertDictEqual(expected_entity_counts, traced.entity_counts)
+        self.assertEqual(3, len(traced.top_allocations))
+        self.assertEqual(3, len(traced.to_dict()['top_allocations']))
+
+    def test_university_summary_pages(self):
+        ''' testing University paginated summaries '''
+        basic: University = University('./test_suites/basic_university')
+
+        # test paging through all students matches full summary
+        paged_rows: List[List] = []
+        cursor: Optional[str] = None
+        page_count: int = 0
+        while True:
+            rows, cursor = basic.get_student_summary_page(
+                page_size=3, cursor=cursor)
+            paged_rows.extend(rows)
+            page_count += 1
+            if cursor is None:
+                break
+        self.assertEqual(4, page_count)
+        self.assertListEqual(sorted(basic.get_student_summary_rows()),
+                             paged_rows)
+
+        # test filters and sort key, indexed once per sort key
+        by_gpa: Callable[[Student], Decimal] = Student.get_gpa
+        rows, cursor = basic.get_student_summary_page(
+            major='SFEN', sort_key=by_gpa, page_size=2)
+        self.assertListEqual(['10103', '10175'], [row[0] for row in rows])
+        index_count: int = len(basic.summary_indexes)
+        rows, cursor = basic.get_student_summary_page(
+            major='SFEN', sort_key=by_gpa, page_size=2, cursor=cursor)
+        self.assertListEqual(['10115', '10172'], [row[0] for row in rows])
+        self.assertEqual(index_count, len(basic.summary_indexes))
+        rows, cursor = basic.get_student_summary_page(
+            cwid_prefix='101', sort_key=by_gpa, page_size=3)
+        self.assertListEqual(['10103', '10175', '10115'], [row[0] for row in rows])
+        rows, cursor = basic.get_student_summary_page(cwid_prefix='117')
+        self.assertListEqual(['11714', '11788'], [row[0] for row in rows])
+        self.assertIsNone(cursor)
+        rows, cursor = basic.get_student_summary_page(
+            predicate=lambda student: student.name.startswith('W'))
+        self.assertListEqual(['10115', '11461'], [row[0] for row in rows])
+
+        rows, cursor = basic.get_instructor_summary_page(
+            department='SYEN', page_size=2)
+        self.assertListEqual([['98760', 'Darwin, C', 'SYEN', 'SYS 611', 2],
+                              ['98760', 'Darwin, C', 'SYEN', 'SYS 645', 1]], rows)
+        rows, cursor = basic.get_instructor_summary_page(
+            department='SYEN', page_size=2, cursor=cursor)
+        self.assertListEqual(['SYS 750', 'SYS 800'], [row[3] for row in rows])
+        self.assertIsNone(cursor)
+        rows, cursor = basic.get_instructor_summary_page(cwid_prefix='98765')
+        self.assertListEqual(['SSW 540', 'SSW 567'], [row[3] for row in rows])
+
+        rows, cursor = basic.get_major_summary_page(page_size=1)
+        self.assertEqual('SFEN', rows[0][0])
+        rows, cursor = basic.get_major_summary_page(
+            page_size=1, cursor=cursor)
+        self.assertEqual('SYEN', rows[0][0])
+        self.assertIsNone(cursor)
+
+        self.assertRaises(ValueError, basic.get_student_summary_page,
+                          page_size=0)
+
+        # test named sort keys share an index, and cursors survive a json round trip
+        rows, cursor = basic.get_student_summary_page(sort_key='gpa', page_size=4)
+        index_count = len(basic.summary_indexes)
+        cursor = json.loads(json.dumps(cursor))
+        rows, cursor = basic.get_student_summary_page(sort_key='gpa', page_size=4, cursor=cursor)
+        self.assertEqual(index_count, len(basic.summary_indexes))
+        self.assertListEqual(
+            [row[0] for row in sorted(basic.get_student_summary_rows(),
+                                      key=lambda row: (Decimal(row[6]), row[0]))[4:8]],
+            [row[0] for row in rows])
+        self.assertRaises(ValueError, basic.get_student_summary_page, sort_key='no_such_key')
+        self.assertRaises(ValueError, basic.get_student_summary_page, sort_key='gpa', cursor='["00000"]')
+        self.assertRaises(ValueError, basic.get_student_summary_page, cursor='not a cursor')
+
+        # test indexes of a new sort key callable on every call are bounded
+        for _ in range(SUMMARY_INDEX_CACHE_SIZE * 2):
+            basic.get_student_summary_page(sort_key=lambda student: student.get_gpa())
+        self.assertEqual(SUMMARY_INDEX_CACHE_SIZE, len(basic.summary_indexes))
+
+    def test_university_attempts(self):
+        ''' testing University attempt index '''
+        with TemporaryDirectory() as directory:
+            # basic university with retakes appended to grades
+            for file_name in [University.MAJOR_FILE_NAME, University.STUDENT_FILE_NAME,
+                              University.INSTRUCTOR_FILE_NAME, University.GRADE_FILE_NAME]:
+                copy(join('./test_suites/basic_university', file_name), directory)
+            with open(join(directory, University.GRADE_FILE_NAME), 'a') as file:
+                file.write('10172|SSW 540|F|98765\n')
+                file.write('10172|SSW 540|D|98765\n')
+                file.write('10172|SSW 540|B|98763\n')
+                file.write('11399|SSW 540|A|98765\n')
+            university: University = University(directory)
+
+        self.assertEqual(27, len(university.attempts))
+        # test index is built by first query
+        self.assertIsNone(university.attempts_by_course)
+        self.assertListEqual(list(range(27)), [
+            attempt.sequence for attempt in university.attempts])
+
+        # test attempts are stored as rows and created when read
+        self.assertEqual(27 * GradeAttempts.WIDTH, len(university.attempts.rows))
+        last: GradeAttempt = university.attempts[-1]
+        self.assertListEqual([26, '11399', 'SSW 540', '98765', 'A', 2],
+                             [getattr(last, name) for name in GradeAttempt.__slots__])
+        self.assertIsNot(last, university.attempts[26])
+        self.assertRaises(IndexError, lambda: university.attempts[27])
+
+        # test attempts of student at course
+        attempts: List[GradeAttempt] = university.get_student_attempts(
+            '10172', 'SSW 540')
+        self.assertListEqual([(23, 'F', '98765', 1), (24, 'D', '98765', 2), (25, 'B', '98763', 3)], [
+            (attempt.sequence, attempt.letter_grade, attempt.instructor_cwid, attempt.attempt)
+            for attempt in attempts
+        ])
+        self.assertListEqual([], university.get_student_attempts(
+            '10172', 'SYS 800'))
+
+        # test course attempts across sections by sequence range
+        self.assertListEqual([14, 18, 19, 22, 23, 24, 25, 26], [
+            attempt.sequence for attempt in university.get_course_attempts('SSW 540')])
+        self.assertListEqual([19, 22, 23], [
+            attempt.sequence for attempt in university.get_course_attempts('SSW 540', 19, 24)])
+        self.assertListEqual([('98763', 'B')], [
+            (attempt.instructor_cwid, attempt.letter_grade)
+            for attempt in university.get_section_attempts('SSW 540', '98763')])
+
+        # test retakes
+        self.assertSetEqual({('11658', 2), ('10172', 3), ('11399', 2)}, {
+            (attempts[0].student_cwid, len(attempts))
+            for attempts in university.get_repeat_attempts('SSW 540')})
+        self.assertListEqual([], university.get_repeat_attempts('SSW 567'))
+        self.assertListEqual([(18, 19), (24, 25)], sorted([
+            (failed.sequence, passed.sequence)
+            for failed, passed in university.get_failed_then_passed()]))
+        self.assertListEqual([(24, 25)], [
+            (failed.sequence, passed.sequence)
+            for failed, passed in university.get_failed_then_passed('SSW 540', different_instructor=True)])
+
+        # test attempts survive binary export and import
+        with TemporaryDirectory() as directory:
+            path: str = join(directory, 'university.bin')
+            university.export_binary(path)
+            imported: University = University.import_binary(path)
+        self.assertListEqual(
+            [[getattr(attempt, name) for name in GradeAttempt.__slots__]
+             for attempt in university.attempts],
+            [[getattr(attempt, name) for name in GradeAttempt.__slots__] for attempt in imported.attempts])
+
+
+class UniversityRepositoryTest(TestCase):
+    def test_university_repository(self):
+        ''' testing UniversityRepository '''
+        repository: UniversityRepository = UniversityRepository(
+            './test_suites/basic_university')
+        old_snapshot: University = repository.snapshot()
+        self.assertEqual(10, len(old_snapshot.students))
+
+        # test reload publishes a new snapshot and keeps the old one intact
+        new_snapshot: University = repository.reload()
+        self.assertIs(new_snapshot, repository.snapshot())
+        self.assertIsNot(old_snapshot, new_snapshot)
+        self.assertEqual(10, len(old_snapshot.students))
+
+        # test reload builds summary indexes in use before publishing
+        new_snapshot.get_student_summary_page(sort_key='gpa')
+        reloaded: University = repository.reload()
+        self.assertListEqual(list(new_snapshot.summary_indexes),
+                             list(reloaded.summary_indexes))
+        new_snapshot = reloaded
+
+        # test failed reload keeps current snapshot and directory
+        self.assertRaises(UniversityDataInvalid, repository.reload,
+                          './test_suites/wrong_student_grades_university')
+        self.assertIs(new_snapshot, repository.snapshot())
+        self.assertEqual('./test_suites/basic_university',
+                         repository.directory)
+
+
+class CliTest(TestCase):
+    def run_cli(self, args: List[str]) -> Tuple[int, str, str]:
+        ''' run command line and capture exit status, stdout and stderr '''
+        stdout: StringIO = StringIO()
+        stderr: StringIO = StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status: int = cli(args)
+
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_cli(self):
+        ''' testing command line entry point '''
+        basic: str = './test_suites/basic_university'
+
+        # test summaries
+        status, output, _ = self.run_cli(['students', basic])
+        self.assertEqual(0, status)
+        lines: List[str] = output.splitlines()
+        self.assertEqual(11, len(lines))
+        self.assertEqual('CWID\tName\tMajor\tCompleted Courses\tRemaing Required\tRemaing Electives\tGPA',
+                         lines[0])
+        self.assertIn('10172\tForbes, I\tSFEN\tSSW 555, SSW 567\t', output)
+
+        status, output, _ = self.run_cli(['--format', 'json', 'majors', basic])
+        self.assertEqual(0, status)
+        self.assertDictEqual({
+            'Major': 'SYEN',
+            'Required Course': ['SYS 612', 'SYS 671', 'SYS 800'],
+            'Electives': ['SSW 540', 'SSW 565', 'SSW 810'],
+        }, json.loads(output.splitlines()[1]))
+
+        status, output, _ = self.run_cli(['instructors', basic])
+        self.assertEqual(0, status)
+        self.assertIn('98765\tEinstein, A\tSFEN\tSSW 540\t3', output)
+
+        # test lookups
+        status, output, _ = self.run_cli(
+            ['--format', 'json', 'student', basic, '11658'])
+        self.assertEqual(0, status)
+        self.assertEqual('2.0', json.loads(output)['GPA'])
+        status, output, _ = self.run_cli(['instructor', basic, '98760'])
+        self.assertEqual(0, status)
+        self.assertListEqual(['SYS 611', 'SYS 645', 'SYS 750', 'SYS 800'], [
+            line.split('\t')[3] for line in output.splitlines()[1:]])
+        status, output, _ = self.run_cli(['student', basic, '10172'])
+        self.assertEqual('10172\tForbes, I\tSFEN\tSSW 555, SSW 567\tSSW 540, SSW 564\tCS 501, CS 513, CS 545\t3.88',
+                         output.splitlines()[1])
+        status, output, error = self.run_cli(['student', basic, '00000'])
+        self.assertEqual((1, ''), (status, output))
+        self.assertEqual('Unknown student 00000.\n', error)
+
+        # test validation
+        status, output, _ = self.run_cli(['--format', 'json', 'validate', basic])
+        self.assertEqual(0, status)
+        self.assertDictEqual({'Valid': True, 'Error': ''}, json.loads(output))
+        status, output, _ = self.run_cli(
+            ['validate', './test_suites/wrong_major_student_university'])
+        self.assertEqual(1, status)
+        self.assertEqual('Valid\tError\nFalse\tUnknown major SYEN for student 10103.\n',
+                         output)
+        status, _, error = self.run_cli(
+            ['majors', './test_suites/no_such_university'])
+        self.assertEqual(1, status)
+        self.assertIn('is not a valid directory', error)
+
+    def test_cli_broken_pipe(self):
+        ''' testing command line exits quietly when pipeline reader closes early '''
+        with TemporaryDirectory() as directory:
+            generate_university(directory, 0, students=5000)
+            process: Popen = Popen([executable, 'Student_Repository_MingWei_Hu.py', 'students', directory],
+                                   stdout=PIPE, stderr=PIPE)
+            process.stdout.readline()
+            process.stdout.close()
+            error: bytes = process.stderr.read()
+            process.stderr.close()
+            self.assertEqual(1, process.wait())
+            self.assertEqual(b'', error)
+
+    def test_lazy_imports(self):
+        ''' testing heavy modules are not imported on module import '''
+        result = run([executable, '-c', '\n'.join([
+            'import sys',
+            'import Student_Repository_MingWei_Hu',
+            "print(*sorted({'typing', 'prettytable', 'threading', 'datetime'} & set(sys.modules)))",
+        ])], capture_output=True, text=True)
+        self.assertEqual('\n', result.stdout)
+
+
+class DifferentialTest(TestCase):
+    def test_differential(self):
+        ''' testing optimized paths against reference University '''
+        # test suites with known failures
+        for name in sorted(listdir('./test_suites')) + ['no_such_university']:
+            timings: Dict[str, float] = run_differential(
+                join('./test_suites', name))
+            self.assertIn('reference', timings)
+
+        # random valid and broken universities
+        with TemporaryDirectory() as directory:
+            for seed, defect in enumerate((None, None) + DEFECTS):
+                generate_university(directory, seed, students=40, defect=defect)
+                # defects must actually break the generated university
+                if defect:
+                    self.assertRaises(
+                        UniversityDataInvalid, University, directory)
+                run_differential(directory)
+
+        # test mismatch of a path is reported
+        self.assertRaises(DifferentialMismatch, run_differential, './test_suites/basic_university', {
+            'broken': lambda directory, work_directory: REFERENCE_PATH(
+                './test_suites/missing_values_university', work_directory),
+        })
+
 
 if __name__ == "__main__":
     main(exit=False, verbosity=2)